@@ -0,0 +1,86 @@
+"""
+Compare process start-up with the JSON map against a binary graph snapshot.
+
+Builds a map `scale` times larger than warehouse_map.json (copies of its
+passages with shifted passage IDs), then times fresh interpreters that
+  - load the JSON map and run build_graph,
+  - load the snapshot (memory-mapped CompactGraph),
+  - load the snapshot and convert it to networkx.
+
+Usage:
+    python benchmarks/bench_graph_snapshot.py [scale]
+"""
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from warehouse_navigation import load_warehouse_map, build_graph  # noqa: E402
+from warehouse_navigation.graph_snapshot import save_graph_snapshot  # noqa: E402
+
+MAP_FILE = ROOT / "warehouse_map.json"
+
+SCRIPTS = {
+    "json + build_graph": "G, _ = build_graph(load_warehouse_map(MAP))",
+    "snapshot (CompactGraph)": "G = load_graph_snapshot(SNAPSHOT)",
+    "snapshot + to_networkx": "G, _ = load_graph_snapshot(SNAPSHOT).to_networkx()",
+}
+
+PRELUDE = """
+import sys, time
+sys.path.insert(0, {root!r})
+from warehouse_navigation import load_warehouse_map, build_graph
+from warehouse_navigation.graph_snapshot import load_graph_snapshot
+MAP, SNAPSHOT = {map!r}, {snapshot!r}
+start = time.perf_counter()
+{body}
+print(time.perf_counter() - start)
+"""
+
+
+def scaled_map(passages, scale):
+    scaled = []
+    for k in range(scale):
+        for p in passages:
+            scaled.append({**p, "passage_id": str(int(p["passage_id"]) + 100 * k)})
+    return scaled
+
+
+def run_fresh(body, map_file, snapshot_file, repeat=5):
+    """Best load time and best total process time over `repeat` fresh interpreters."""
+    code = PRELUDE.format(root=str(ROOT), map=str(map_file), snapshot=str(snapshot_file), body=body)
+    best_load = best_total = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        best_total = min(best_total, time.perf_counter() - start)
+        best_load = min(best_load, float(out.strip().splitlines()[-1]))
+    return best_load, best_total
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workdir = Path(tempfile.mkdtemp())
+    map_file = workdir / "warehouse_map.json"
+    snapshot_file = workdir / "warehouse_map.graph.bin"
+
+    passages = scaled_map(load_warehouse_map(MAP_FILE), scale)
+    map_file.write_text(json.dumps({"passages": passages}))
+    G, _ = build_graph(passages)
+    save_graph_snapshot(G, snapshot_file)
+    print(f"{len(G)} nodes; JSON {map_file.stat().st_size / 1024:.0f} KB, "
+          f"snapshot {snapshot_file.stat().st_size / 1024:.0f} KB")
+
+    print(f"{'':<26} {'load':>10} {'process':>10}")
+    for label, body in SCRIPTS.items():
+        load, total = run_fresh(body, map_file, snapshot_file)
+        print(f"{label:<26} {load * 1000:8.1f}ms {total * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
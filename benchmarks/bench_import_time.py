@@ -0,0 +1,94 @@
+"""
+Import-time regression check for the package entry points.
+
+Each entry point is imported in fresh interpreters under `python -X importtime`.
+The script sums the cumulative time of every module the statement imports
+beyond a bare interpreter start-up, and keeps the best of several runs. It
+also checks that none of the heavy optional backends got loaded. It exits
+with status 1 when an entry point is over its budget or pulls in a forbidden
+module.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat N] [--scale FACTOR]
+
+--scale multiplies every budget (e.g. 2 on a slow CI machine).
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (statement, budget in milliseconds, modules that must not be imported)
+ENTRY_POINTS = {
+    "estimation": (
+        "from preflight_dynamic_path import run_estimation",
+        150,
+        ("numpy", "sqlalchemy", "boto3", "botocore", "matplotlib", "networkx"),
+    ),
+    "routing": (
+        "from warehouse_navigation import load_warehouse_map, build_graph, shortest_path, generate_drone_path",
+        400,
+        ("matplotlib", "sqlalchemy", "boto3", "botocore"),
+    ),
+}
+
+CHECK_MODULES = "import sys; print(','.join(m for m in {modules!r} if m in sys.modules))"
+
+
+def _top_level_imports(stderr: str) -> dict:
+    """Cumulative microseconds of each top-level import reported by -X importtime."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        # Nested imports are indented under their parent; only top-level ones are summed
+        if not line.rsplit("|", 1)[1].startswith("  "):
+            imports[name] = int(cumulative)
+    return imports
+
+
+def _run(code: str):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            check=True, capture_output=True, text=True)
+    return result.stdout.strip(), _top_level_imports(result.stderr)
+
+
+def measure(statement: str, forbidden, repeat: int):
+    """Return (best milliseconds, forbidden modules that were imported)."""
+    _, baseline = _run("pass")
+    best = float("inf")
+    loaded = []
+    for _ in range(repeat):
+        stdout, imports = _run(f"{statement}\n{CHECK_MODULES.format(modules=tuple(forbidden))}")
+        elapsed = sum(us for name, us in imports.items() if name not in baseline) / 1000
+        best = min(best, elapsed)
+        loaded = [m for m in stdout.splitlines()[-1].split(",") if m] if stdout else []
+    return best, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the import time of the package entry points.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per entry point")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget by this factor")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'entry point':<12} {'import':>10} {'budget':>10}  status")
+    for label, (statement, budget_ms, forbidden) in ENTRY_POINTS.items():
+        elapsed, loaded = measure(statement, forbidden, args.repeat)
+        budget = budget_ms * args.scale
+        status = "ok"
+        if elapsed > budget:
+            status = "OVER BUDGET"
+        if loaded:
+            status = f"loaded {', '.join(loaded)}"
+        failed |= status != "ok"
+        print(f"{label:<12} {elapsed:8.1f}ms {budget:8.1f}ms  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Compare plan_routes against calling shortest_path + generate_drone_path once per mission.
+
+Usage:
+    python benchmarks/bench_plan_routes.py [num_missions]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import networkx as nx  # noqa: E402
+
+from warehouse_navigation import (  # noqa: E402
+    load_warehouse_map, build_graph, shortest_path, generate_drone_path, plan_routes, build_route_table,
+)
+from warehouse_navigation.route_planner import _find_paths  # noqa: E402
+
+MAP_FILE = Path(__file__).resolve().parent.parent / "warehouse_map.json"
+OFFSET = (-4, 1.0, 2.2)
+
+
+def per_call_loop(G, pairs):
+    for start, end in pairs:
+        coords, _ = shortest_path(G, start, end, return_coords=True)
+        generate_drone_path(coordinates=coords, offset=OFFSET, wait_period=2)
+
+
+def search_loop(G, pairs):
+    for start, end in pairs:
+        nx.shortest_path(G, source=start, target=end)
+
+
+def batched_search(G, pairs, processes):
+    ends_by_start = {}
+    for start, end in pairs:
+        ends_by_start.setdefault(start, {})[end] = None
+    _find_paths(G, {start: list(ends) for start, ends in ends_by_start.items()}, None, processes, 1)
+
+
+def timed(label, func, num_missions, repeat=3):
+    # generate_drone_path prints its coordinates; keep the output out of the timing
+    elapsed = float("inf")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"{label:<32} {elapsed:8.3f} s  {num_missions / elapsed:10.0f} missions/s")
+
+
+def main():
+    num_missions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    G, _ = build_graph(load_warehouse_map(MAP_FILE))
+    nodes = list(G.nodes)
+    rng = random.Random(0)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(num_missions)]
+
+    print(f"{num_missions} missions over {len(nodes)} nodes")
+    print("-- path search only")
+    timed("nx.shortest_path loop", lambda: search_loop(G, pairs), num_missions)
+    timed("single-source per start", lambda: batched_search(G, pairs, 1), num_missions)
+    print("-- full planning (search + commands)")
+    timed("shortest_path loop", lambda: per_call_loop(G, pairs), num_missions)
+    timed("plan_routes (serial)", lambda: plan_routes(G, pairs, OFFSET, 2, processes=1), num_missions)
+    timed("plan_routes (process pool)",
+          lambda: plan_routes(G, pairs, OFFSET, 2, processes=max(2, os.cpu_count() or 1),
+                              parallel_threshold=1), num_missions)
+    route_table = build_route_table(G)
+    timed("plan_routes (route table)",
+          lambda: plan_routes(G, pairs, OFFSET, 2, route_table=route_table), num_missions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare the shelf setters on a seeded SQLite database before and after models/shelf_migration.py.
+
+Seeds 100 passages x 50 columns x 20 levels x 10 subcolumns = 1,000,000
+shelves, times level-wide, column-wide and passage-wide updates with the
+LIKE filters, migrates the table and times the same updates again.
+
+Usage:
+    python benchmarks/bench_shelf_index.py [db_file]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.shelf_migration import migrate_shelves  # noqa: E402
+from preflight_dynamic_path.warehouse_metadata import aurora_app  # noqa: E402
+
+PASSAGES, COLUMNS, LEVELS, SUBCOLUMNS = 100, 50, 20, 10
+
+
+def seed(db_file):
+    with sqlite3.connect(db_file) as conn:
+        conn.execute("CREATE TABLE shelves (id VARCHAR(7) PRIMARY KEY, "
+                     "position_x FLOAT, position_y FLOAT, position_z FLOAT)")
+        for p in range(PASSAGES):
+            rows = [(f"{p:02d}{c:02d}{lv:02d}{s}", p * 1.0, c * 1.0, lv * 1.0)
+                    for c in range(COLUMNS) for lv in range(LEVELS) for s in range(SUBCOLUMNS)]
+            conn.executemany("INSERT INTO shelves VALUES (?, ?, ?, ?)", rows)
+
+
+def run_updates():
+    # Every passage/level/column is touched once per call
+    timings = {}
+    start = time.perf_counter()
+    for lv in range(LEVELS):
+        aurora_app.set_shelf_z_for_passage_level("42", f"{lv:02d}", 1.5)
+    timings["level (z)"] = (time.perf_counter() - start) / LEVELS
+
+    start = time.perf_counter()
+    for c in range(COLUMNS):
+        aurora_app.set_shelf_y_for_passage_column("42", f"{c:02d}", 2.5)
+    timings["column (y)"] = (time.perf_counter() - start) / COLUMNS
+
+    start = time.perf_counter()
+    for p in range(0, PASSAGES, 10):
+        aurora_app.set_shelf_x_for_passage(f"{p:02d}", 3.5)
+    timings["passage (x)"] = (time.perf_counter() - start) / (PASSAGES // 10)
+    return timings
+
+
+def main():
+    if len(sys.argv) > 1:
+        db_file = sys.argv[1]
+    else:
+        db_file = os.path.join(tempfile.mkdtemp(), "shelves.db")
+    db_url = f"sqlite:///{db_file}"
+
+    start = time.perf_counter()
+    seed(db_file)
+    print(f"Seeded {PASSAGES * COLUMNS * LEVELS * SUBCOLUMNS} shelves in {time.perf_counter() - start:.1f} s")
+
+    aurora_app.configure(db_url)
+    before = run_updates()
+
+    start = time.perf_counter()
+    migrate_shelves(db_url)
+    print(f"Migrated in {time.perf_counter() - start:.1f} s")
+    aurora_app.dispose_engine()
+    after = run_updates()
+
+    print(f"{'update':<12} {'LIKE':>10} {'indexed':>10} {'speedup':>8}")
+    for label in before:
+        print(f"{label:<12} {before[label] * 1000:8.1f}ms {after[label] * 1000:8.1f}ms "
+              f"{before[label] / after[label]:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
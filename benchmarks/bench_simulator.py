@@ -0,0 +1,73 @@
+"""
+Time the kinematic simulator on a long synthetic path.
+
+Builds a path of `num_commands` commands (takeoff, then XY moves, altitude
+changes, waits and speed changes), writes it as JSON, and reports the best
+of several runs for
+  - simulate on already extracted CommandArrays,
+  - simulate_path, which also loads and parses the JSON file,
+  - the default constant-speed estimate_path, for reference.
+
+Usage:
+    python benchmarks/bench_simulator.py [num_commands]
+"""
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from preflight_dynamic_path.flight_time.columnar import extract_command_arrays  # noqa: E402
+from preflight_dynamic_path.flight_time.config_loader import load_config  # noqa: E402
+from preflight_dynamic_path.flight_time.estimator import estimate_path  # noqa: E402
+from preflight_dynamic_path.flight_time.simulator import simulate, simulate_path  # noqa: E402
+
+
+def synthetic_path(num_commands, seed=0):
+    rng = random.Random(seed)
+    commands = [{"type": "SCHEDULE_TAKEOFF", "arguments": {"z": 1.0, "max_speed_xy": 1.0}}]
+    while len(commands) < num_commands:
+        roll = rng.random()
+        if roll < 0.45:
+            commands.append({"type": "SCHEDULE_FLY_TO_XY",
+                             "arguments": {"x": round(rng.uniform(-50, 50), 2), "y": round(rng.uniform(-20, 20), 2)}})
+        elif roll < 0.6:
+            commands.append({"type": "SCHEDULE_FLY_TO_Z", "arguments": {"z": round(rng.uniform(0.2, 6), 2)}})
+        elif roll < 0.65:
+            commands.append({"type": "SCHEDULE_SET_XY_SPEED", "arguments": {"speed": rng.choice([0.5, 1.0, 1.5])}})
+        else:
+            commands.append({"type": "SCHEDULE_WAIT_FOR_PERIOD", "arguments": {"period": 2}})
+    return commands
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    num_commands = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    config = load_config(ROOT / "examples" / "config.yaml")
+    commands = synthetic_path(num_commands)
+    path_file = Path(tempfile.mkdtemp()) / "path.json"
+    path_file.write_text(json.dumps(commands))
+    arrays = extract_command_arrays(commands)
+
+    print(f"{num_commands} commands")
+    print(f"{'simulate (arrays)':<28} {best_of(lambda: simulate(arrays, config)) * 1000:8.1f}ms")
+    print(f"{'simulate_path (JSON file)':<28} {best_of(lambda: simulate_path(config, path_file)) * 1000:8.1f}ms")
+    print(f"{'estimate_path (JSON file)':<28} {best_of(lambda: estimate_path(config, path_file)) * 1000:8.1f}ms")
+    print(f"simulated {simulate_path(config, path_file)['flight_duration']}, "
+          f"constant-speed {estimate_path(config, path_file)['flight_duration']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, Computed, Index
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -44,3 +44,25 @@ class NavigationWaypoint(Base):
 
     is_intersection = Column(Boolean, nullable=False, default=False)
     is_entrance = Column(Boolean, nullable=False, default=False)
+
+
+class Shelf(Base):
+    __tablename__ = "shelves"
+
+    # 7-digit shelf ID: passage (2) + column (2) + level (2) + subcolumn (1)
+    id = Column(String(7), primary_key=True)
+
+    position_x = Column(Float)
+    position_y = Column(Float)
+    position_z = Column(Float)
+
+    # ID components, derived by the database so they can be indexed and filtered with "="
+    id_passage = Column(String(2), Computed("substr(id, 1, 2)", persisted=True))
+    id_column = Column(String(2), Computed("substr(id, 3, 2)", persisted=True))
+    id_level = Column(String(2), Computed("substr(id, 5, 2)", persisted=True))
+    id_subcolumn = Column(String(1), Computed("substr(id, 7, 1)", persisted=True))
+
+    __table_args__ = (
+        Index("ix_shelves_passage_level", "id_passage", "id_level"),
+        Index("ix_shelves_passage_column", "id_passage", "id_column"),
+    )
@@ -0,0 +1,82 @@
+import argparse
+from typing import List, Union
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+from models.models import Shelf
+
+# ID component columns added to an existing shelves table, in order
+DERIVED_COLUMNS = ("id_passage", "id_column", "id_level", "id_subcolumn")
+
+
+def _add_column_ddl(engine: Engine, name: str) -> str:
+    column = Shelf.__table__.c[name]
+    type_sql = column.type.compile(dialect=engine.dialect)
+    expression = column.computed.sqltext
+    backend = engine.dialect.name
+    if backend == "postgresql":
+        # PostgreSQL 12+ computes STORED columns for the existing rows while adding them
+        return f"ALTER TABLE shelves ADD COLUMN {name} {type_sql} GENERATED ALWAYS AS ({expression}) STORED"
+    if backend == "sqlite":
+        # SQLite can only add VIRTUAL generated columns; they are still indexable
+        return f"ALTER TABLE shelves ADD COLUMN {name} {type_sql} GENERATED ALWAYS AS ({expression}) VIRTUAL"
+    raise ValueError(f"Unsupported database for the shelves migration: {backend}")
+
+
+def migrate_shelves(engine: Union[Engine, str], dry_run: bool = False) -> List[str]:
+    """
+    Add the shelf ID components (passage, column, level, subcolumn, as split
+    by validate_shelf_id) to the shelves table as generated columns, and
+    index them.
+
+    The columns are computed by the database from the ID, so existing rows
+    need no backfill and inserts keep them in sync. The migration is
+    idempotent: only missing columns and indexes are created. Reflect the
+    table again afterwards (aurora_app.dispose_engine()) so the setters
+    switch from LIKE patterns to equality filters.
+
+    Args:
+        engine: SQLAlchemy engine or database URL.
+        dry_run: Only return the statements; nothing is executed.
+
+    Returns:
+        The DDL statements that were (or, on a dry run, would be) executed.
+    """
+    if isinstance(engine, str):
+        engine = create_engine(engine, future=True)
+
+    inspector = inspect(engine)
+    if not inspector.has_table("shelves"):
+        raise ValueError("The database has no shelves table.")
+
+    existing_columns = {column["name"] for column in inspector.get_columns("shelves")}
+    existing_indexes = {index["name"] for index in inspector.get_indexes("shelves")}
+
+    statements = [_add_column_ddl(engine, name) for name in DERIVED_COLUMNS if name not in existing_columns]
+    statements += [str(CreateIndex(index).compile(dialect=engine.dialect))
+                   for index in sorted(Shelf.__table__.indexes, key=lambda index: index.name)
+                   if index.name not in existing_indexes]
+    if statements:
+        # Refresh the planner statistics so the new indexes get used
+        statements.append("ANALYZE shelves")
+
+    if not dry_run:
+        with engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+    return statements
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add indexed shelf ID component columns to the shelves table.")
+    parser.add_argument("db_url", help="SQLAlchemy database URL, e.g. sqlite:///shelves.db")
+    parser.add_argument("--dry-run", action="store_true", help="print the statements without running them")
+    args = parser.parse_args()
+
+    statements = migrate_shelves(args.db_url, dry_run=args.dry_run)
+    for statement in statements:
+        print(statement.strip() + ";")
+    if not statements:
+        print("The shelves table is already up to date.")
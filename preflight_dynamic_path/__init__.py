@@ -1,4 +1,35 @@
-from .flight_time.estimator import run_estimation
-from .flight_time.path_parser import load_path
-from .warehouse_metadata.aurora_app import get_shelf_position as aurora_get_shelf_position
-from .warehouse_metadata.dynamodb_app import get_shelf_position as dynamodb_get_shelf_position
+from importlib import import_module
+
+# Public name -> (module, attribute). Modules are imported on first access, so
+# importing the package does not pull in SQLAlchemy, boto3 or NumPy.
+_EXPORTS = {
+    "run_estimation": (".flight_time.estimator", "run_estimation"),
+    "run_batch_estimation": (".flight_time.batch", "run_batch_estimation"),
+    "load_path": (".flight_time.path_parser", "load_path"),
+    "aurora_get_shelf_position": (".warehouse_metadata.aurora_app", "get_shelf_position"),
+    "aurora_get_shelf_positions": (".warehouse_metadata.aurora_app", "get_shelf_positions"),
+    "aurora_get_shelf_position_async": (".warehouse_metadata.aurora_app", "get_shelf_position_async"),
+    "aurora_get_shelf_positions_async": (".warehouse_metadata.aurora_app", "get_shelf_positions_async"),
+    "dynamodb_get_shelf_position": (".warehouse_metadata.dynamodb_app", "get_shelf_position"),
+    "dynamodb_get_shelf_positions": (".warehouse_metadata.dynamodb_app", "get_shelf_positions"),
+    "dynamodb_get_shelf_position_async": (".warehouse_metadata.dynamodb_app", "get_shelf_position_async"),
+    "dynamodb_get_shelf_positions_async": (".warehouse_metadata.dynamodb_app", "get_shelf_positions_async"),
+    "ShelfPositionCache": (".warehouse_metadata.shelf_cache", "ShelfPositionCache"),
+    "get_shelf_cache": (".warehouse_metadata.shelf_cache", "get_shelf_cache"),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    try:
+        module, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
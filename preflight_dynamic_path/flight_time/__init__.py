@@ -1 +1 @@
-from .estimator import run_estimation
\ No newline at end of file
+from .estimator import run_estimation, estimate_path
@@ -0,0 +1,160 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Union
+
+from .config_loader import load_config
+from .estimator import estimate_path
+
+_worker_config: Optional[Dict] = None
+_worker_options: Dict = {}
+
+
+def resolve_path_files(paths: Union[str, Path, Sequence[Union[str, Path]]]) -> List[Path]:
+    """
+    Expand a directory, glob pattern or list of files into a sorted list of path files.
+
+    Args:
+        paths: a directory (all *.json files in it), a glob pattern, or a list of files.
+
+    Returns:
+        list of Path.
+    """
+    if isinstance(paths, (str, Path)):
+        path = Path(paths)
+        if path.is_dir():
+            return sorted(path.glob("*.json"))
+        if path.exists():
+            return [path]
+        return [Path(p) for p in sorted(glob.glob(str(paths), recursive=True))]
+    return [Path(p) for p in paths]
+
+
+def _estimate_record(config: Dict, path_file: Path, options: Dict) -> Dict:
+    """Estimate one file, turning any failure into an error record."""
+    try:
+        results = estimate_path(config, path_file, **options)
+        results["path_file"] = str(path_file)
+        return results
+    except Exception as e:
+        return {"path_file": str(path_file), "error": f"{type(e).__name__}: {e}"}
+
+
+def _init_worker(config: Dict, options: Dict):
+    global _worker_config, _worker_options
+    _worker_config = config
+    _worker_options = options
+
+
+def _worker_estimate(path_file: Path) -> Dict:
+    return _estimate_record(_worker_config, path_file, _worker_options)
+
+
+def iter_batch_estimation(config_file: Union[str, Path], paths, processes: Optional[int] = None,
+                          max_pending: Optional[int] = None, vectorized: bool = False,
+                          streaming: Optional[bool] = None) -> Iterator[Dict]:
+    """
+    Estimate many path files with one config, yielding results as they finish.
+
+    The config is parsed once. Files are estimated on a process pool with at
+    most max_pending files in flight, so memory stays bounded however many
+    files there are. A file that fails yields {"path_file", "error"} instead
+    of aborting the batch.
+
+    Args:
+        config_file (str | Path): Path to YAML config file; its path_file is ignored.
+        paths: directory, glob pattern or list of path files.
+        processes (int): worker processes; defaults to the CPU count, 1 runs in-process.
+        max_pending (int): files submitted but not finished; defaults to 2 per worker.
+        vectorized (bool): use the columnar estimator.
+        streaming (bool): parse each file incrementally in constant memory per file;
+            defaults to streaming unless vectorized is set.
+
+    Yields:
+        dict: One result or error record per file, in completion order.
+    """
+    if streaming is None:
+        streaming = not vectorized
+    elif streaming and vectorized:
+        raise ValueError("streaming and vectorized are mutually exclusive")
+    config = load_config(config_file)
+    options = {"vectorized": vectorized, "streaming": streaming}
+    path_files = resolve_path_files(paths)
+
+    workers = processes if processes is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(path_files) <= 1:
+        for path_file in path_files:
+            yield _estimate_record(config, path_file, options)
+        return
+
+    max_pending = max_pending or workers * 2
+    remaining = iter(path_files)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config, options)) as pool:
+        pending = set()
+        for path_file in remaining:
+            pending.add(pool.submit(_worker_estimate, path_file))
+            if len(pending) >= max_pending:
+                break
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                for path_file in remaining:
+                    pending.add(pool.submit(_worker_estimate, path_file))
+                    break
+
+
+def run_batch_estimation(config_file: Union[str, Path], paths, output: Union[str, Path, TextIO],
+                         **kwargs) -> Dict[str, int]:
+    """
+    Estimate many path files and stream the results to a JSONL file.
+
+    Each line is written and flushed as soon as its file finishes.
+
+    Args:
+        config_file (str | Path): Path to YAML config file.
+        paths: directory, glob pattern or list of path files.
+        output: JSONL file path or an open text stream.
+        **kwargs: forwarded to iter_batch_estimation.
+
+    Returns:
+        dict: Counts of files estimated ("ok"), failed ("failed") and in total ("total").
+    """
+    summary = {"total": 0, "ok": 0, "failed": 0}
+
+    def write_all(f: TextIO):
+        for record in iter_batch_estimation(config_file, paths, **kwargs):
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            summary["total"] += 1
+            summary["failed" if "error" in record else "ok"] += 1
+
+    if isinstance(output, (str, Path)):
+        with open(output, "w", encoding="utf-8") as f:
+            write_all(f)
+    else:
+        write_all(output)
+
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estimate many path files with one config.")
+    parser.add_argument("config", help="YAML config file")
+    parser.add_argument("paths", nargs="+", help="directory, glob pattern or path files")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("-p", "--processes", type=int, default=None, help="worker processes")
+    parser.add_argument("--vectorized", action="store_true", help="use the columnar estimator")
+    parser.add_argument("--no-streaming", dest="streaming", action="store_false", default=None,
+                        help="load each path file whole instead of parsing it incrementally")
+    args = parser.parse_args()
+
+    paths = args.paths[0] if len(args.paths) == 1 else args.paths
+    summary = run_batch_estimation(args.config, paths, args.output or sys.stdout, processes=args.processes,
+                                   vectorized=args.vectorized, streaming=args.streaming)
+    print(f"Estimated {summary['ok']} of {summary['total']} files ({summary['failed']} failed).", file=sys.stderr)
@@ -1,6 +1,9 @@
-from typing import List, Dict, Any
+from bisect import bisect_left
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from math import sqrt
 
+FACTOR_NAMES = ("horizontal", "vertical_up", "vertical_down", "wait")
+
 def get_commands_count(commands: List[Dict]) -> Dict[str, int]:
     """
     Count occurrences of each command type in the path commands.
@@ -23,33 +26,45 @@ def get_flight_speed(commands: List[Dict[str, Any]]) -> float:
     """
     Extract the average XY flight speed from path commands.
 
-    Looks for:
-    - SCHEDULE_SET_XY_SPEED (explicit speed set)
-    - SCHEDULE_TAKEOFF (max_speed_xy)
+    Looks for the first positive speed set by:
+    - SET_SPEED / SCHEDULE_SET_XY_SPEED (explicit speed set)
+    - TAKEOFF / SCHEDULE_TAKEOFF (max_speed_xy)
 
     Args:
-        commands (list[dict]): List of command dictionaries from the path.
+        commands (list[dict]): Normalized commands (see extract_commands) or raw path commands.
 
     Returns:
         float: The flight speed in m/s. Defaults to 1.0 if not found.
     """
     for cmd in commands:
-        cmd_type = cmd.get("type")
-        args = cmd.get("arguments", {})
-
-        if cmd_type == "SCHEDULE_SET_XY_SPEED":
-            speed = args.get("speed")
-            if speed and speed > 0:
-                return float(speed)
-
-        elif cmd_type == "SCHEDULE_TAKEOFF":
-            max_speed = args.get("max_speed_xy")
-            if max_speed and max_speed > 0:
-                return float(max_speed)
+        speed = _command_speed(cmd)
+        if speed is not None:
+            return speed
 
     # Default speed if none is set
     return 1.0
 
+def _command_speed(cmd: Dict[str, Any]) -> Optional[float]:
+    """Flight speed set by a single command, as recognized by get_flight_speed."""
+    cmd_type = cmd.get("type")
+
+    # Normalized commands carry the speed in force on the command itself
+    if cmd_type in ("SET_SPEED", "TAKEOFF"):
+        speed = cmd.get("speed")
+
+    elif cmd_type == "SCHEDULE_SET_XY_SPEED":
+        speed = cmd.get("arguments", {}).get("speed")
+
+    elif cmd_type == "SCHEDULE_TAKEOFF":
+        speed = cmd.get("arguments", {}).get("max_speed_xy")
+
+    else:
+        return None
+
+    if speed and speed > 0:
+        return float(speed)
+    return None
+
 def calculate_total_wait(commands: List[Dict]) -> float:
     """
     Sum all WAIT command durations in seconds.
@@ -84,3 +99,83 @@ def calculate_distances(commands: List[Dict]) -> Dict[str, float]:
                              "z": cmd.get("z", last_pos["z"])})
 
     return {"horizontal": horizontal, "vertical_up": vertical_up, "vertical_down": vertical_down, "total": horizontal + vertical_up + vertical_down}
+
+
+def accumulate_totals(commands: Iterable[Dict]) -> Tuple[float, float, Dict[str, float], Dict[str, int]]:
+    """
+    Compute flight speed, total wait, distances and command counts in one pass.
+
+    Gives the same results as get_flight_speed, calculate_total_wait,
+    calculate_distances and get_commands_count, but consumes the commands
+    once and keeps only running totals, so it works on generators of any length.
+
+    Args:
+        commands (iterable of dict): Normalized commands, e.g. from iter_commands.
+
+    Returns:
+        tuple: (flight speed, total wait in seconds, distances dict, command counts dict).
+    """
+    speed = None
+    total_wait = 0
+    counts = {}
+    horizontal = 0.0
+    vertical_up = 0.0
+    vertical_down = 0.0
+    last_x = last_y = last_z = 0.0
+
+    for cmd in commands:
+        cmd_type = cmd["type"]
+        counts[cmd_type] = counts.get(cmd_type, 0) + 1
+
+        if speed is None:
+            speed = _command_speed(cmd)
+
+        if cmd_type == "WAIT":
+            total_wait += cmd.get("duration", 0.0)
+
+        elif cmd_type in {"MOVE_XY", "MOVE_Z", "TAKEOFF"}:
+            x, y, z = cmd.get("x", last_x), cmd.get("y", last_y), cmd.get("z", last_z)
+            dx, dy, dz = x - last_x, y - last_y, z - last_z
+
+            horizontal += sqrt(dx**2 + dy**2)
+            if dz > 0:
+                vertical_up += dz
+            elif dz < 0:
+                vertical_down += -dz
+
+            last_x, last_y, last_z = x, y, z
+
+    distances = {"horizontal": horizontal, "vertical_up": vertical_up, "vertical_down": vertical_down,
+                 "total": horizontal + vertical_up + vertical_down}
+    return (speed if speed is not None else 1.0), total_wait, distances, counts
+
+
+def calibration_factors(config: Dict, speed: float) -> Dict[str, float]:
+    """
+    Calibration factors for a flight speed.
+
+    Factors are interpolated linearly between the two nearest calibrated
+    speeds in calibration.speeds, and held at the nearest calibrated speed
+    outside their range. Factors missing from an entry count as 1.0.
+
+    Args:
+        config (dict): Parsed config (see load_config).
+        speed (float): Flight speed in m/s.
+
+    Returns:
+        dict: horizontal, vertical_up, vertical_down and wait factors.
+    """
+    speeds = (config.get("calibration") or {}).get("speeds") or {}
+    if not speeds:
+        return dict.fromkeys(FACTOR_NAMES, 1.0)
+
+    points = sorted((float(s), factors or {}) for s, factors in speeds.items())
+    keys = [s for s, _ in points]
+    i = bisect_left(keys, speed)
+    if i < len(keys) and keys[i] == speed:
+        lo = hi = i
+    else:
+        lo, hi = max(i - 1, 0), min(i, len(keys) - 1)
+    t = 0.0 if lo == hi else (speed - keys[lo]) / (keys[hi] - keys[lo])
+    low, high = points[lo][1], points[hi][1]
+    return {name: low.get(name, 1.0) + t * (high.get(name, 1.0) - low.get(name, 1.0)) for name in FACTOR_NAMES}
@@ -0,0 +1,263 @@
+"""
+Fit calibration factors and command delays from logged flights.
+
+run_estimation's model is linear in its coefficients. For a flight at speed v
+it predicts
+
+    horizontal / v * f_horizontal + vertical_up / v * f_vertical_up
+    + vertical_down / v * f_vertical_down + wait * f_wait
+    + sum over command types of count * delay + landing
+
+where v is the first speed the path sets (SCHEDULE_SET_XY_SPEED or
+SCHEDULE_TAKEOFF.max_speed_xy, 1.0 m/s if none), the factors f belong to
+that speed and the delays are shared by all speeds. Given many (path file,
+measured seconds) pairs, every coefficient is fitted in one non-negative
+least-squares solve (Lawson-Hanson). Coefficients the flights cannot tell
+apart keep their current config value: a column that is a combination of
+earlier ones (such as the TAKEOFF count when every path also sets one
+speed, or the WAIT count against the wait time of paths with a fixed wait
+period) is left out of the solve, and so are coefficients with no data. A
+small ridge term pulls the fitted coefficients towards their current values.
+
+Usage:
+    python -m preflight_dynamic_path.flight_time.calibration config.yaml flights.csv [-o calibrated.yaml | --overwrite]
+
+flights.csv has the columns path_file and duration_seconds; relative paths
+are resolved against the CSV's directory.
+"""
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import yaml
+
+from .calculations import FACTOR_NAMES, accumulate_totals, calibration_factors
+from .config_loader import load_config
+from .path_parser import iter_commands, load_path
+
+DELAY_NAMES = ("WAIT", "SET_SPEED", "TAKEOFF", "MOVE_XY", "MOVE_Z")
+
+
+def flight_features(path_file: Union[str, Path]) -> Tuple[float, List[float]]:
+    """
+    Totals of one path file that the estimator's coefficients multiply.
+
+    Returns:
+        tuple: (flight speed, [horizontal / speed, vertical_up / speed,
+        vertical_down / speed, wait, one count per DELAY_NAMES entry]).
+    """
+    speed, raw_wait, distances, counts = accumulate_totals(iter_commands(load_path(path_file)))
+    if speed <= 0:
+        raise ValueError(f"Flight speed must be greater than 0 in {path_file}")
+    return speed, [distances["horizontal"] / speed, distances["vertical_up"] / speed,
+                   distances["vertical_down"] / speed, raw_wait] + [counts.get(name, 0) for name in DELAY_NAMES]
+
+
+def load_flight_log(csv_file: Union[str, Path]) -> List[Tuple[Path, float]]:
+    """
+    Read (path file, measured seconds) pairs from a CSV with path_file and duration_seconds columns.
+    """
+    csv_file = Path(csv_file)
+    if not csv_file.exists():
+        raise FileNotFoundError(f"Flight log not found: {csv_file}")
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    if rows and not {"path_file", "duration_seconds"} <= rows[0].keys():
+        raise ValueError("Flight log must have path_file and duration_seconds columns")
+    return [(csv_file.parent / row["path_file"], float(row["duration_seconds"])) for row in rows]
+
+
+def _nnls(A: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Lawson-Hanson non-negative least squares: argmin ||A x - b|| subject to x >= 0."""
+    n = A.shape[1]
+    x = np.zeros(n)
+    passive = np.zeros(n, dtype=bool)
+    tol = 10 * np.finfo(np.float64).eps * np.abs(A).sum(axis=0).max(initial=0.0) * max(A.shape)
+    for _ in range(3 * n):
+        gradient = A.T @ (b - A @ x)
+        if passive.all() or gradient[~passive].max() <= tol:
+            break
+        passive[np.argmax(np.where(passive, -np.inf, gradient))] = True
+        while True:
+            z = np.zeros(n)
+            z[passive] = np.linalg.lstsq(A[:, passive], b, rcond=None)[0]
+            if (z[passive] > 0).all():
+                x = z
+                break
+            # Step towards z until the first coefficient hits zero, then drop it
+            blocking = passive & (z <= 0)
+            alpha = np.min(x[blocking] / (x[blocking] - z[blocking]))
+            x = x + alpha * (z - x)
+            passive &= x > tol
+            x[~passive] = 0.0
+    return x
+
+
+def _independent_columns(A: np.ndarray, tol: float = 1e-9) -> np.ndarray:
+    """
+    Mask of a maximal set of linearly independent columns, chosen greedily
+    left to right; all-zero columns are never chosen.
+    """
+    norms = np.linalg.norm(A, axis=0)
+    basis = np.zeros((A.shape[0], 0))
+    keep = np.zeros(A.shape[1], dtype=bool)
+    for j in np.flatnonzero(norms > 0):
+        column = A[:, j] / norms[j]
+        residual = column - basis @ (basis.T @ column)
+        length = np.linalg.norm(residual)
+        if length > tol:
+            basis = np.column_stack([basis, residual / length])
+            keep[j] = True
+    return keep
+
+
+def _solve(A: np.ndarray, b: np.ndarray, prior: np.ndarray, ridge: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ridge-to-prior non-negative least squares over the identifiable columns of A.
+
+    Returns:
+        (coefficients, mask of the columns that were fitted); the others keep their prior.
+    """
+    free = _independent_columns(A)
+    x = prior.copy()
+    if free.any():
+        cols = np.flatnonzero(free)
+        # Residual after the coefficients kept at their prior, then the regularized system on the rest
+        residual = b - A[:, ~free] @ prior[~free]
+        weights = np.sqrt(ridge) * np.linalg.norm(A[:, cols], axis=0)
+        system = np.vstack([A[:, cols], np.diag(weights)])
+        target = np.concatenate([residual, weights * prior[cols]])
+        x[cols] = _nnls(system, target)
+    return x, free
+
+
+def fit_calibration(config: Dict, flights: Sequence[Tuple[Union[str, Path], float]], ridge: float = 1e-6,
+                    processes: Optional[int] = None) -> Dict:
+    """
+    Fit calibration factors per flight speed and shared command delays.
+
+    Args:
+        config (dict): Parsed config (see load_config); supplies the current
+            values the fit is regularized towards and the landing phase.
+        flights: (path file, measured flight duration in seconds) pairs.
+        ridge (float): Strength of the pull towards the current values.
+        processes (int): Worker processes for reading path files; defaults
+            to the CPU count, 1 reads them in this process.
+
+    Returns:
+        dict: speeds (speed -> factors), command_delays_seconds, flights,
+        kept (the coefficients with data that the flights cannot separate
+        from others, e.g. "TAKEOFF" or "1.0/wait", left at their current
+        value), and the RMS error in seconds before and after the fit.
+    """
+    if not flights:
+        raise ValueError("No flights to fit")
+    path_files = [path_file for path_file, _ in flights]
+    processes = processes or os.cpu_count() or 1
+    if processes > 1 and len(path_files) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            features = list(pool.map(flight_features, path_files, chunksize=max(1, len(path_files) // (processes * 4))))
+    else:
+        features = [flight_features(path_file) for path_file in path_files]
+
+    speeds = np.array([speed for speed, _ in features])
+    totals = np.array([row for _, row in features], dtype=np.float64)
+    landing_sec = config.get("landing_phase_duration_minutes", 0) * 60
+    measured = np.array([seconds for _, seconds in flights], dtype=np.float64) - landing_sec
+
+    # One block of factor columns per distinct speed, then the shared delay columns
+    groups = np.unique(speeds)
+    n_factors = len(FACTOR_NAMES)
+    group_of = np.searchsorted(groups, speeds)
+    A = np.zeros((len(flights), len(groups) * n_factors + len(DELAY_NAMES)))
+    for g in range(len(groups)):
+        rows = group_of == g
+        A[rows, g * n_factors:(g + 1) * n_factors] = totals[rows, :n_factors]
+    A[:, len(groups) * n_factors:] = totals[:, n_factors:]
+
+    delays = config.get("command_delays_seconds") or {}
+    prior = np.array([calibration_factors(config, float(speed))[name] for speed in groups for name in FACTOR_NAMES]
+                     + [float(delays.get(name, 0.0)) for name in DELAY_NAMES])
+    x, fitted = _solve(A, measured, prior, ridge)
+
+    labels = [f"{float(speed)}/{name}" for speed in groups for name in FACTOR_NAMES] + list(DELAY_NAMES)
+    has_data = np.linalg.norm(A, axis=0) > 0
+    factors = x[:len(groups) * n_factors].reshape(len(groups), n_factors)
+    return {
+        "speeds": {float(speed): dict(zip(FACTOR_NAMES, row.tolist())) for speed, row in zip(groups, factors)},
+        "command_delays_seconds": dict(zip(DELAY_NAMES, x[len(groups) * n_factors:].tolist())),
+        "flights": len(flights),
+        "kept": [label for label, data, fit in zip(labels, has_data, fitted) if data and not fit],
+        "rmse_before": float(np.sqrt(np.mean((A @ prior - measured) ** 2))),
+        "rmse_after": float(np.sqrt(np.mean((A @ x - measured) ** 2))),
+    }
+
+
+def apply_calibration(config: Dict, fit: Dict, digits: int = 4) -> Dict:
+    """
+    Return a copy of config with the fitted factors and delays written in.
+
+    Speeds that were not fitted keep their existing entries.
+    """
+    calibration = dict(config.get("calibration") or {})
+    speeds = dict(calibration.get("speeds") or {})
+    for speed, factors in fit["speeds"].items():
+        speeds[speed] = {name: round(value, digits) for name, value in factors.items()}
+    calibration["speeds"] = dict(sorted(speeds.items(), key=lambda item: float(item[0])))
+
+    delays = dict(config.get("command_delays_seconds") or {})
+    delays.update({name: round(value, digits) for name, value in fit["command_delays_seconds"].items()})
+    return {**config, "command_delays_seconds": delays, "calibration": calibration}
+
+
+def calibrated_config_path(config_file: Union[str, Path]) -> Path:
+    """Default output of write_calibration: config.yaml -> config.calibrated.yaml."""
+    config_file = Path(config_file)
+    return config_file.with_name(f"{config_file.stem}.calibrated{config_file.suffix}")
+
+
+def write_calibration(config_file: Union[str, Path], fit: Dict, output: Optional[Union[str, Path]] = None,
+                      overwrite: bool = False) -> Path:
+    """
+    Write a fit back in the config format. Comments in the original file are not preserved.
+
+    Args:
+        config_file (str | Path): Config the fit started from.
+        fit (dict): Output of fit_calibration.
+        output (str | Path): Destination; defaults to calibrated_config_path(config_file).
+        overwrite (bool): Write over config_file instead (when output is not given).
+
+    Returns:
+        Path: The file written.
+    """
+    if output is None:
+        output = config_file if overwrite else calibrated_config_path(config_file)
+    output = Path(output)
+    calibrated = apply_calibration(load_config(config_file), fit)
+    with open(output, "w", encoding="utf-8") as f:
+        yaml.safe_dump(calibrated, f, sort_keys=False)
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit calibration factors and command delays from logged flights.")
+    parser.add_argument("config", help="YAML config file")
+    parser.add_argument("flights", help="CSV with path_file and duration_seconds columns")
+    parser.add_argument("-o", "--output", help="calibrated config file (default: <config>.calibrated.yaml)")
+    parser.add_argument("--overwrite", action="store_true", help="write the fit over the config file")
+    parser.add_argument("-p", "--processes", type=int, default=None, help="worker processes")
+    parser.add_argument("--ridge", type=float, default=1e-6, help="pull towards the current values")
+    args = parser.parse_args()
+
+    fit = fit_calibration(load_config(args.config), load_flight_log(args.flights), ridge=args.ridge,
+                          processes=args.processes)
+    written = write_calibration(args.config, fit, args.output, overwrite=args.overwrite)
+    print(f"Fitted {fit['flights']} flights: RMS error {fit['rmse_before']:.1f}s -> {fit['rmse_after']:.1f}s; "
+          f"wrote {written}", file=sys.stderr)
+    if fit["kept"]:
+        print(f"Kept current values (not separable in these flights): {', '.join(fit['kept'])}", file=sys.stderr)
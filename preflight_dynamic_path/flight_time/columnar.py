@@ -0,0 +1,225 @@
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from .path_parser import RELEVANT_COMMANDS
+
+# Normalized command types, indexed by their type code
+COMMAND_TYPES = ("WAIT", "SET_SPEED", "TAKEOFF", "MOVE_XY", "MOVE_Z")
+TYPE_CODES = {name: code for code, name in enumerate(COMMAND_TYPES)}
+
+WAIT, SET_SPEED, TAKEOFF, MOVE_XY, MOVE_Z = range(len(COMMAND_TYPES))
+MOVE_CODES = (TAKEOFF, MOVE_XY, MOVE_Z)
+
+
+class CommandArrays:
+    """
+    Columnar form of the normalized commands produced by extract_commands.
+
+    Row i describes command i. For WAIT and SET_SPEED rows x/y/z hold the
+    last known position so every row has a valid position.
+
+    Attributes:
+        type_codes: int8 array of indices into COMMAND_TYPES.
+        x, y, z: float64 positions.
+        duration: float64 WAIT durations (0 for other commands).
+        speed: float64 speeds (0 for WAIT).
+    """
+
+    def __init__(self, type_codes: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                 duration: np.ndarray, speed: np.ndarray):
+        self.type_codes = type_codes
+        self.x = x
+        self.y = y
+        self.z = z
+        self.duration = duration
+        self.speed = speed
+
+    def __len__(self) -> int:
+        return len(self.type_codes)
+
+    @property
+    def move_mask(self) -> np.ndarray:
+        """Boolean mask of TAKEOFF, MOVE_XY and MOVE_Z rows."""
+        return np.isin(self.type_codes, MOVE_CODES)
+
+    def to_commands(self) -> List[Dict]:
+        """Convert back to the list-of-dicts form returned by extract_commands."""
+        commands = []
+        rows = zip(self.type_codes.tolist(), self.x.tolist(), self.y.tolist(), self.z.tolist(),
+                   self.duration.tolist(), self.speed.tolist())
+        for code, x, y, z, duration, speed in rows:
+            if code == WAIT:
+                commands.append({"type": "WAIT", "duration": duration})
+            elif code == SET_SPEED:
+                commands.append({"type": "SET_SPEED", "speed": speed})
+            else:
+                commands.append({"type": COMMAND_TYPES[code], "x": x, "y": y, "z": z, "speed": speed})
+        return commands
+
+
+class _ColumnBuilder:
+    """Accumulates command rows into Python lists before a single conversion to arrays."""
+
+    def __init__(self):
+        self.type_codes, self.x, self.y, self.z, self.duration, self.speed = [], [], [], [], [], []
+
+    def append(self, code: int, x: float, y: float, z: float, duration: float, speed: float):
+        self.type_codes.append(code)
+        self.x.append(x)
+        self.y.append(y)
+        self.z.append(z)
+        self.duration.append(duration)
+        self.speed.append(speed)
+
+    def build(self) -> CommandArrays:
+        return CommandArrays(
+            np.array(self.type_codes, dtype=np.int8),
+            np.array(self.x, dtype=np.float64),
+            np.array(self.y, dtype=np.float64),
+            np.array(self.z, dtype=np.float64),
+            np.array(self.duration, dtype=np.float64),
+            np.array(self.speed, dtype=np.float64),
+        )
+
+
+def commands_to_arrays(commands: Iterable[Dict]) -> CommandArrays:
+    """
+    Convert normalized commands (as returned by extract_commands) into CommandArrays.
+    """
+    columns = _ColumnBuilder()
+    x = y = z = 0.0
+    for cmd in commands:
+        code = TYPE_CODES[cmd["type"]]
+        if code == WAIT:
+            columns.append(code, x, y, z, cmd.get("duration", 0.0), 0.0)
+        elif code == SET_SPEED:
+            columns.append(code, x, y, z, 0.0, cmd["speed"])
+        else:
+            x, y, z = cmd.get("x", x), cmd.get("y", y), cmd.get("z", z)
+            columns.append(code, x, y, z, 0.0, cmd.get("speed", 0.0))
+    return columns.build()
+
+
+def extract_command_arrays(path_data: Iterable[Dict[str, Any]]) -> CommandArrays:
+    """
+    Extract the commands relevant for flight analysis straight into CommandArrays.
+
+    Equivalent to commands_to_arrays(extract_commands(path_data)) without
+    allocating a dictionary per command.
+
+    Args:
+        path_data (list of dict): Parsed JSON path data.
+    Returns:
+        CommandArrays: Normalized commands in columnar form.
+    """
+    columns = _ColumnBuilder()
+    current_speed = None
+    x = y = z = 0.0
+
+    for cmd in path_data:
+        cmd_type = cmd.get("type")
+        if cmd_type not in RELEVANT_COMMANDS:
+            continue
+        args = cmd.get("arguments", {})
+
+        if cmd_type == "SCHEDULE_WAIT_FOR_PERIOD":
+            columns.append(WAIT, x, y, z, float(args.get("period", 0.0)), 0.0)
+
+        elif cmd_type == "SCHEDULE_SET_XY_SPEED":
+            current_speed = float(args.get("speed", current_speed or 0.0))
+            columns.append(SET_SPEED, x, y, z, 0.0, current_speed)
+
+        elif cmd_type == "SCHEDULE_TAKEOFF":
+            x, y, z = float(args.get("x", 0.0)), float(args.get("y", 0.0)), float(args.get("z", 0.0))
+            speed = float(args.get("max_speed_xy", current_speed or 0.0))
+            columns.append(TAKEOFF, x, y, z, 0.0, speed)
+
+        elif cmd_type == "SCHEDULE_FLY_TO_XY":
+            x, y = float(args.get("x", x)), float(args.get("y", y))
+            columns.append(MOVE_XY, x, y, z, 0.0, current_speed or 0.0)
+
+        elif cmd_type == "SCHEDULE_FLY_TO_Z":
+            z = float(args.get("z", z))
+            columns.append(MOVE_Z, x, y, z, 0.0, current_speed or 0.0)
+
+    return columns.build()
+
+
+def _move_deltas(arrays: CommandArrays):
+    """Per-move (dx, dy, dz) from the previous move, starting at the origin like calculate_distances."""
+    mask = arrays.move_mask
+    dx = np.diff(arrays.x[mask], prepend=0.0)
+    dy = np.diff(arrays.y[mask], prepend=0.0)
+    dz = np.diff(arrays.z[mask], prepend=0.0)
+    return mask, dx, dy, dz
+
+
+def _sequential_sum(values: np.ndarray) -> float:
+    # cumsum adds left to right like the list-based loops, so totals match them bit for bit
+    return float(np.cumsum(values)[-1]) if len(values) else 0.0
+
+
+def calculate_distances(arrays: CommandArrays) -> Dict[str, float]:
+    """
+    Columnar equivalent of calculations.calculate_distances.
+    """
+    _, dx, dy, dz = _move_deltas(arrays)
+    horizontal = _sequential_sum(np.sqrt(dx * dx + dy * dy))
+    vertical_up = _sequential_sum(np.where(dz > 0, dz, 0.0))
+    vertical_down = _sequential_sum(np.where(dz < 0, -dz, 0.0))
+    return {"horizontal": horizontal, "vertical_up": vertical_up, "vertical_down": vertical_down,
+            "total": horizontal + vertical_up + vertical_down}
+
+
+def calculate_total_wait(arrays: CommandArrays) -> float:
+    """
+    Columnar equivalent of calculations.calculate_total_wait.
+    """
+    return _sequential_sum(arrays.duration[arrays.type_codes == WAIT])
+
+
+def get_commands_count(arrays: CommandArrays) -> Dict[str, int]:
+    """
+    Columnar equivalent of calculations.get_commands_count, keyed in order of first appearance.
+    """
+    counts = np.bincount(arrays.type_codes, minlength=len(COMMAND_TYPES))
+    codes, first_seen = np.unique(arrays.type_codes, return_index=True)
+    return {COMMAND_TYPES[code]: int(counts[code]) for code in codes[np.argsort(first_seen)].tolist()}
+
+
+def get_flight_speed(arrays: CommandArrays) -> float:
+    """
+    Columnar equivalent of calculations.get_flight_speed: the first positive
+    speed on a SET_SPEED or TAKEOFF row, or 1.0 if there is none.
+    """
+    setters = np.flatnonzero(np.isin(arrays.type_codes, (SET_SPEED, TAKEOFF)) & (arrays.speed > 0))
+    return float(arrays.speed[setters[0]]) if len(setters) else 1.0
+
+
+def segment_times(arrays: CommandArrays, avg_speed: float, factors: Dict[str, float],
+                  command_delays: Dict[str, float]) -> np.ndarray:
+    """
+    Estimated duration of every command in seconds, using run_estimation's cost model.
+
+    Moves take their horizontal and vertical distance divided by avg_speed,
+    scaled by the calibration factors; WAITs take their calibrated duration;
+    every command also pays its command delay.
+
+    Returns:
+        float64 array with one duration per command.
+    """
+    seconds = np.zeros(len(arrays), dtype=np.float64)
+
+    mask, dx, dy, dz = _move_deltas(arrays)
+    move_seconds = np.sqrt(dx * dx + dy * dy) / avg_speed * factors.get("horizontal", 1.0)
+    move_seconds += np.where(dz > 0, dz, 0.0) / avg_speed * factors.get("vertical_up", 1.0)
+    move_seconds += np.where(dz < 0, -dz, 0.0) / avg_speed * factors.get("vertical_down", 1.0)
+    seconds[mask] = move_seconds
+
+    waits = arrays.type_codes == WAIT
+    seconds[waits] = arrays.duration[waits] * factors.get("wait", 1.0)
+
+    delays = np.array([command_delays.get(name, 0.0) for name in COMMAND_TYPES], dtype=np.float64)
+    seconds += delays[arrays.type_codes]
+    return seconds
@@ -1,44 +1,112 @@
 from pathlib import Path
 from typing import Union, Dict
 from .config_loader import load_config
-from .path_parser import load_path, extract_commands
-from .calculations import calculate_total_wait, calculate_distances, get_flight_speed, get_commands_count
+from .path_parser import load_path, extract_commands, iter_path, iter_commands
+from .calculations import calculate_total_wait, calculate_distances, get_flight_speed, get_commands_count, \
+    accumulate_totals, calibration_factors
 from .utils import _format_time
 
-def run_estimation(config_file: Union[str, Path]) -> Dict:
+def run_estimation(config_file: Union[str, Path], vectorized: bool = False, streaming: bool = False,
+                   simulate: bool = False) -> Dict:
     """
     Run the full estimation pipeline, including calibrated time vs battery.
 
     Args:
         config_file (str | Path): Path to YAML config file.
+        vectorized (bool): Use the columnar NumPy implementation (same results,
+            faster on long paths).
+        streaming (bool): Parse the path file incrementally and accumulate the
+            totals in constant memory (same results, for very large files).
+        simulate (bool): Time the flight with the kinematic simulator (see
+            simulator.py) instead of the calibrated constant-speed model.
 
     Returns:
         dict: A dictionary containing the flight path analysis results.
     """
     config = load_config(config_file)
     path_file = config.get("path_file")
-    battery_time_min = config.get("battery_time_minutes")
-    landing_duration_min = config.get("landing_phase_duration_minutes", 0)
 
     if not path_file:
         raise ValueError("Config must include 'path_file'")
+
+    return estimate_path(config, path_file, vectorized=vectorized, streaming=streaming, simulate=simulate)
+
+def estimate_path(config: Dict, path_file: Union[str, Path], vectorized: bool = False,
+                  streaming: bool = False, simulate: bool = False) -> Dict:
+    """
+    Estimate one path file against an already loaded config.
+
+    Args:
+        config (dict): Parsed config (see load_config); its path_file is ignored.
+        path_file (str | Path): Path to the JSON command file.
+        vectorized (bool): Use the columnar NumPy implementation.
+        streaming (bool): Parse the path file incrementally in constant memory.
+        simulate (bool): Use the kinematic simulator; vectorized and streaming are ignored.
+
+    Returns:
+        dict: A dictionary containing the flight path analysis results.
+    """
+    battery_time_min = config.get("battery_time_minutes")
     if battery_time_min is None or battery_time_min <= 0:
         raise ValueError("Config must include positive 'battery_time_minutes'")
 
+    if simulate:
+        # Needs NumPy, like the vectorized estimator
+        from .simulator import simulate_path
+
+        return simulate_path(config, path_file)
+
+    if streaming:
+        avg_speed, raw_wait, distances, commands_count = accumulate_totals(iter_commands(iter_path(path_file)))
+        return summarize_estimation(config, path_file, avg_speed, raw_wait, distances, commands_count)
+
     path_data = load_path(path_file)
-    commands = extract_commands(path_data)
 
-    # Extract average flight speed from the path
-    avg_speed = get_flight_speed(commands)
+    if vectorized:
+        # NumPy is only needed here, so it is not imported with the package
+        from . import columnar
+
+        arrays = columnar.extract_command_arrays(path_data)
+        avg_speed = columnar.get_flight_speed(arrays)
+        raw_wait = columnar.calculate_total_wait(arrays)
+        distances = columnar.calculate_distances(arrays)
+        commands_count = columnar.get_commands_count(arrays)
+    else:
+        commands = extract_commands(path_data)
+        # Extract average flight speed from the path
+        avg_speed = get_flight_speed(commands)
+        raw_wait = calculate_total_wait(commands)
+        distances = calculate_distances(commands)
+        commands_count = get_commands_count(commands)
+
+    return summarize_estimation(config, path_file, avg_speed, raw_wait, distances, commands_count)
+
+def summarize_estimation(config: Dict, path_file, avg_speed: float, raw_wait: float,
+                         distances: Dict[str, float], commands_count: Dict[str, int]) -> Dict:
+    """
+    Apply calibration, command delays and the battery budget to path totals.
+
+    Args:
+        config (dict): Parsed config (see load_config).
+        path_file: Path file the totals were computed from.
+        avg_speed (float): Flight speed in m/s.
+        raw_wait (float): Uncalibrated sum of WAIT durations in seconds.
+        distances (dict): Output of calculate_distances.
+        commands_count (dict): Output of get_commands_count.
+
+    Returns:
+        dict: A dictionary containing the flight path analysis results.
+    """
+    battery_time_min = config.get("battery_time_minutes")
+    landing_duration_min = config.get("landing_phase_duration_minutes", 0)
+
     if avg_speed <= 0:
         raise ValueError("Flight speed must be greater than 0")
 
-    # Get calibration factors for this speed
-    calibration = config.get("calibration", {}).get("speeds", {})
-    factors = calibration.get(avg_speed, {"horizontal": 1.0, "vertical_up": 1.0, "vertical_down": 1.0, "wait": 1.0})
+    # Get calibration factors for this speed, interpolated between calibrated speeds
+    factors = calibration_factors(config, avg_speed)
 
-    total_wait = calculate_total_wait(commands) * factors.get("wait", 1.0)
-    distances = calculate_distances(commands)
+    total_wait = raw_wait * factors.get("wait", 1.0)
 
     # Apply calibration factors
     time_horizontal = distances["horizontal"] / avg_speed * factors.get("horizontal", 1.0)
@@ -47,8 +115,6 @@ def run_estimation(config_file: Union[str, Path]) -> Dict:
 
     total_time_sec = time_horizontal + time_vertical_up + time_vertical_down + total_wait
 
-    commands_count = get_commands_count(commands)
-
     command_delays = config.get("command_delays_seconds", {})
     total_command_delay_sec = sum(
         commands_count.get(cmd_type, 0) * delay
@@ -1,6 +1,16 @@
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+from .schedule_format import ARGUMENTS, COMMAND_TYPES, HEADER, MAGIC, OPCODES, RECORD, check_header
+
+try:
+    import ijson
+except ImportError:  # optional, the built-in tokenizer is used instead
+    ijson = None
+
+STREAM_CHUNK_SIZE = 1 << 16
+BinaryData = Union[bytes, bytearray, memoryview]
 
 RELEVANT_COMMANDS = {
     "SCHEDULE_TAKEOFF",
@@ -23,19 +33,186 @@ def load_path(path_file: Union[str, Path]) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"Path file not found: {path_file}")
 
+    if is_binary_path(path):
+        return load_binary_path(path)
+
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def extract_commands(path_data: List[Dict]) -> List[Dict]:
+def is_binary_path(path_file: Union[str, Path]) -> bool:
+    """Return True if the file is a packed binary schedule (see schedule_format)."""
+    with open(path_file, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def iter_binary_commands(data: BinaryData) -> Iterator[Dict[str, Any]]:
     """
-    Extract and normalize the commands relevant for flight analysis.
+    Decode the commands of an in-memory binary schedule.
 
     Args:
-        path_data (list of dict): Parsed JSON path data.
+        data (bytes): Header and records, as written by write_binary_schedule.
     Returns:
-        list of dict: Normalized commands for calculation.
+        iterator of dict: Commands in the same form as the JSON path file.
+    """
+    data = memoryview(data)
+    check_header(data)
+    return _decode_records(data[HEADER.size:])
+
+_WAIT, _FLY_TO_XY, _FLY_TO_Z = (OPCODES[t] for t in ("SCHEDULE_WAIT_FOR_PERIOD", "SCHEDULE_FLY_TO_XY", "SCHEDULE_FLY_TO_Z"))
+
+def _decode_records(body: BinaryData) -> Iterator[Dict[str, Any]]:
+    if len(body) % RECORD.size:
+        raise ValueError("Binary schedule ends in a partial record")
+    for opcode, a, b, c, d in RECORD.iter_unpack(body):
+        # NaN (a != a) marks an argument that was not given; the common complete moves and waits skip the check loop
+        if opcode == _WAIT and a == a:
+            yield {"type": "SCHEDULE_WAIT_FOR_PERIOD", "arguments": {"period": a}}
+        elif opcode == _FLY_TO_XY and a == a and b == b:
+            yield {"type": "SCHEDULE_FLY_TO_XY", "arguments": {"x": a, "y": b}}
+        elif opcode == _FLY_TO_Z and a == a:
+            yield {"type": "SCHEDULE_FLY_TO_Z", "arguments": {"z": a}}
+        else:
+            cmd_type = COMMAND_TYPES.get(opcode)
+            if cmd_type is None:
+                raise ValueError(f"Unknown binary schedule opcode {opcode}")
+            yield {"type": cmd_type,
+                   "arguments": {name: value for name, value in zip(ARGUMENTS[cmd_type], (a, b, c, d))
+                                 if value == value}}
+
+def iter_binary_path(path_file: Union[str, Path], chunk_records: int = 4096) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the commands of a binary schedule file in constant memory.
+
+    Args:
+        path_file (str | Path): Path to the binary schedule.
+        chunk_records (int): Records read per chunk.
+    Yields:
+        dict: Commands in the same form as the JSON path file.
     """
-    commands = []
+    with open(path_file, "rb") as f:
+        header = f.read(HEADER.size)
+        check_header(header)
+        while True:
+            chunk = f.read(chunk_records * RECORD.size)
+            if not chunk:
+                return
+            yield from _decode_records(chunk)
+
+def load_binary_path(path_file: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Load a binary schedule file.
+
+    Args:
+        path_file (str | Path): Path to the binary schedule.
+    Returns:
+        list of dict: Commands in the same form as the JSON path file.
+    """
+    with open(path_file, "rb") as f:
+        return list(iter_binary_commands(f.read()))
+
+def _iter_json_array(f, chunk_size: int) -> Iterator[Any]:
+    """Decode the elements of a top-level JSON array one at a time from a text stream."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    skip_whitespace()
+    if pos >= len(buffer) or buffer[pos] != "[":
+        raise ValueError("Path file must contain a JSON array of commands")
+    pos += 1
+
+    expect_value = True
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise ValueError("Unexpected end of path file")
+        if buffer[pos] == "]":
+            return
+        if not expect_value:
+            if buffer[pos] != ",":
+                raise ValueError(f"Expected ',' in path file, found {buffer[pos]!r}")
+            pos += 1
+            expect_value = True
+            continue
+
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # A number is only complete once the next delimiter is in the buffer ("2." may be "2.5")
+            truncated = isinstance(item, (int, float)) and not isinstance(item, bool) and (
+                end == len(buffer) or buffer[end] not in " \t\r\n,]")
+            if truncated and not eof and fill():
+                continue
+            break
+        pos = end
+        expect_value = False
+        yield item
+
+def iter_path(path_file: Union[str, Path], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the commands of a path JSON file one at a time.
+
+    Unlike load_path, memory use does not grow with the file size. ijson is
+    used when installed; otherwise a built-in incremental tokenizer is used.
+    Binary schedules are detected and read with iter_binary_path.
+
+    Args:
+        path_file (str | Path): Path to JSON file holding an array of commands.
+        chunk_size (int): Characters read per chunk by the built-in tokenizer.
+    Yields:
+        dict: One raw command at a time.
+    """
+    path = Path(path_file)
+    if not path.exists():
+        raise FileNotFoundError(f"Path file not found: {path_file}")
+
+    if is_binary_path(path):
+        yield from iter_binary_path(path)
+        return
+
+    if ijson is not None:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "item", use_float=True)
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        yield from _iter_json_array(f, chunk_size)
+
+def iter_commands(path_data: Union[Iterable[Dict], BinaryData]) -> Iterator[Dict]:
+    """
+    Lazily extract and normalize the commands relevant for flight analysis.
+
+    Args:
+        path_data (iterable of dict | bytes): Raw commands, e.g. from load_path
+            or iter_path, or the contents of a binary schedule.
+    Yields:
+        dict: Normalized commands for calculation.
+    """
+    if isinstance(path_data, (bytes, bytearray, memoryview)):
+        path_data = iter_binary_commands(path_data)
+
     current_speed = None
     last_position = {"x": 0.0, "y": 0.0, "z": 0.0}
 
@@ -47,26 +224,35 @@ def extract_commands(path_data: List[Dict]) -> List[Dict]:
             continue
 
         if cmd_type == "SCHEDULE_WAIT_FOR_PERIOD":
-            commands.append({"type": "WAIT", "duration": float(args.get("period", 0.0))})
+            yield {"type": "WAIT", "duration": float(args.get("period", 0.0))}
 
         elif cmd_type == "SCHEDULE_SET_XY_SPEED":
             current_speed = float(args.get("speed", current_speed or 0.0))
-            commands.append({"type": "SET_SPEED", "speed": current_speed})
+            yield {"type": "SET_SPEED", "speed": current_speed}
 
         elif cmd_type == "SCHEDULE_TAKEOFF":
             x, y, z = float(args.get("x", 0.0)), float(args.get("y", 0.0)), float(args.get("z", 0.0))
             speed = float(args.get("max_speed_xy", current_speed or 0.0))
             last_position.update({"x": x, "y": y, "z": z})
-            commands.append({"type": "TAKEOFF", "x": x, "y": y, "z": z, "speed": speed})
+            yield {"type": "TAKEOFF", "x": x, "y": y, "z": z, "speed": speed}
 
         elif cmd_type == "SCHEDULE_FLY_TO_XY":
             x, y = float(args.get("x", last_position["x"])), float(args.get("y", last_position["y"]))
-            commands.append({"type": "MOVE_XY", "x": x, "y": y, "z": last_position["z"], "speed": current_speed or 0.0})
+            yield {"type": "MOVE_XY", "x": x, "y": y, "z": last_position["z"], "speed": current_speed or 0.0}
             last_position.update({"x": x, "y": y})
 
         elif cmd_type == "SCHEDULE_FLY_TO_Z":
             z = float(args.get("z", last_position["z"]))
-            commands.append({"type": "MOVE_Z", "z": z, "x": last_position["x"], "y": last_position["y"], "speed": current_speed or 0.0})
+            yield {"type": "MOVE_Z", "z": z, "x": last_position["x"], "y": last_position["y"], "speed": current_speed or 0.0}
             last_position.update({"z": z})
 
-    return commands
\ No newline at end of file
+def extract_commands(path_data: Union[List[Dict], BinaryData]) -> List[Dict]:
+    """
+    Extract and normalize the commands relevant for flight analysis.
+
+    Args:
+        path_data (list of dict | bytes): Parsed JSON path data, or the contents of a binary schedule.
+    Returns:
+        list of dict: Normalized commands for calculation.
+    """
+    return list(iter_commands(path_data))
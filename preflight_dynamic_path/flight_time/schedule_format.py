@@ -0,0 +1,107 @@
+"""
+Packed binary schedule format.
+
+A schedule file is a 16-byte header followed by one fixed-size record per
+command:
+
+    header: magic b"DPSCHED\\0", uint32 version, uint32 record size (little-endian)
+    record: uint8 opcode, 3 padding bytes, 4 x float32 arguments
+
+The arguments of each command type are stored in the order given by
+ARGUMENTS; unused slots and missing optional arguments hold NaN, so readers
+return the same argument keys as the JSON form. Values are float32, i.e.
+accurate to about 7 significant digits.
+"""
+import math
+import struct
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Union
+
+MAGIC = b"DPSCHED\0"
+VERSION = 1
+HEADER = struct.Struct("<8sII")
+RECORD = struct.Struct("<B3x4f")
+WRITE_CHUNK_RECORDS = 4096
+
+# Command type -> opcode, and the argument stored in each float slot
+OPCODES = {
+    "SCHEDULE_TAKEOFF": 1,
+    "SCHEDULE_SET_XY_SPEED": 2,
+    "SCHEDULE_WAIT_FOR_PERIOD": 3,
+    "SCHEDULE_FLY_TO_XY": 4,
+    "SCHEDULE_FLY_TO_Z": 5,
+}
+COMMAND_TYPES = {code: cmd_type for cmd_type, code in OPCODES.items()}
+ARGUMENTS = {
+    "SCHEDULE_TAKEOFF": ("x", "y", "z", "max_speed_xy"),
+    "SCHEDULE_SET_XY_SPEED": ("speed",),
+    "SCHEDULE_WAIT_FOR_PERIOD": ("period",),
+    "SCHEDULE_FLY_TO_XY": ("x", "y"),
+    "SCHEDULE_FLY_TO_Z": ("z",),
+}
+
+_NAN = math.nan
+# Argument names padded to the four record slots (None is never a key, so it packs as NaN)
+_SLOTS = {cmd_type: names + (None,) * (4 - len(names)) for cmd_type, names in ARGUMENTS.items()}
+
+
+def pack_command(cmd: Dict) -> bytes:
+    """
+    Pack one schedule command into a binary record.
+
+    Args:
+        cmd (dict): Command with "type" and "arguments", as in the JSON form.
+    Returns:
+        bytes: RECORD.size bytes.
+    """
+    cmd_type = cmd.get("type")
+    slots = _SLOTS.get(cmd_type)
+    if slots is None:
+        raise ValueError(f"Command type {cmd_type!r} has no binary schedule opcode")
+    args = cmd.get("arguments", {})
+    try:
+        return RECORD.pack(OPCODES[cmd_type], *[args.get(name, _NAN) for name in slots])
+    except struct.error as e:
+        raise ValueError(f"Invalid arguments for {cmd_type}: {args}") from e
+
+
+def header() -> bytes:
+    return HEADER.pack(MAGIC, VERSION, RECORD.size)
+
+
+def write_binary_schedule(commands: Iterable[Dict], output: Union[str, Path, BinaryIO]) -> int:
+    """
+    Write commands to a binary schedule, consuming them one at a time.
+
+    Args:
+        commands (iterable of dict): Schedule commands, e.g. from iter_drone_path.
+        output (str | Path | file): Destination path or binary file object.
+    Returns:
+        int: Number of records written.
+    """
+    if not hasattr(output, "write"):
+        with open(output, "wb") as f:
+            return write_binary_schedule(commands, f)
+
+    output.write(header())
+    count = 0
+    chunk = []
+    for cmd in commands:
+        chunk.append(pack_command(cmd))
+        if len(chunk) == WRITE_CHUNK_RECORDS:
+            output.write(b"".join(chunk))
+            count += len(chunk)
+            chunk = []
+    output.write(b"".join(chunk))
+    return count + len(chunk)
+
+
+def check_header(data: bytes) -> None:
+    """Raise ValueError unless `data` starts with a supported schedule header."""
+    if len(data) < HEADER.size:
+        raise ValueError("Binary schedule is shorter than its header")
+    magic, version, record_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a binary schedule (bad magic)")
+    if version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"Unsupported binary schedule version {version} (record size {record_size})")
@@ -0,0 +1,252 @@
+"""
+Kinematic flight simulation.
+
+Instead of dividing distances by one average speed and correcting the
+result with calibration factors, every move is timed with a trapezoidal
+velocity profile: the drone accelerates from rest to its speed limit,
+cruises, and decelerates to rest at the target. Short moves that never
+reach the limit get a triangular profile. The horizontal part of a move
+uses the commanded XY speed (SCHEDULE_SET_XY_SPEED, or the max_speed_xy of
+SCHEDULE_TAKEOFF) and the vertical part uses separate climb and descent
+limits. All commands are simulated at once with NumPy.
+
+The vehicle is described by the optional `kinematics` section of the
+flight-time config:
+
+    kinematics:
+      default_speed_xy: 1.0     # m/s when the path sets no speed
+      max_speed_xy: 2.0         # cap on commanded XY speeds
+      acceleration_xy: 0.8      # m/s^2
+      speed_up: 0.5             # m/s
+      speed_down: 0.4           # m/s
+      acceleration_z: 0.5       # m/s^2
+      battery_capacity_wh: 60
+      power_watts:
+        hover: 180              # waits, command delays and landing
+        horizontal: 200
+        climb: 260
+        descend: 150
+
+Missing speeds default to 1.0 m/s and a missing (or 0) acceleration means
+speed changes are instantaneous, so an empty section reproduces the
+uncalibrated constant-speed estimate. Without power_watts the battery is
+assumed to drain evenly over battery_time_minutes.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from .columnar import COMMAND_TYPES, SET_SPEED, TAKEOFF, WAIT, CommandArrays, extract_command_arrays, \
+    get_commands_count, calculate_distances
+from .path_parser import load_path
+from .utils import _format_time
+
+POWER_PHASES = ("hover", "horizontal", "climb", "descend")
+
+
+class FlightTimeline:
+    """
+    Per-command result of simulate.
+
+    Attributes:
+        type_codes: int8 indices into COMMAND_TYPES.
+        start, end: float64 seconds since the start of the flight.
+        battery_used: float64 fraction of the battery drawn by the end of each command.
+        energy_wh: float64 cumulative energy in Wh, or None without power_watts.
+        moving_seconds: seconds spent travelling, without waits and command delays.
+    """
+
+    def __init__(self, type_codes: np.ndarray, start: np.ndarray, end: np.ndarray,
+                 battery_used: np.ndarray, energy_wh: Optional[np.ndarray], moving_seconds: float = 0.0):
+        self.type_codes = type_codes
+        self.start = start
+        self.end = end
+        self.battery_used = battery_used
+        self.energy_wh = energy_wh
+        self.moving_seconds = moving_seconds
+
+    def __len__(self) -> int:
+        return len(self.type_codes)
+
+    @property
+    def duration(self) -> float:
+        """Seconds from takeoff to the end of the last command."""
+        return float(self.end[-1]) if len(self.end) else 0.0
+
+    def to_records(self) -> List[Dict]:
+        """One dictionary per command with type, start, end, battery_used (and energy_wh)."""
+        columns = [self.type_codes.tolist(), self.start.tolist(), self.end.tolist(), self.battery_used.tolist()]
+        records = [{"type": COMMAND_TYPES[code], "start": start, "end": end, "battery_used": used}
+                   for code, start, end, used in zip(*columns)]
+        if self.energy_wh is not None:
+            for record, energy in zip(records, self.energy_wh.tolist()):
+                record["energy_wh"] = energy
+        return records
+
+
+def trapezoid_time(distance: np.ndarray, max_speed, acceleration) -> np.ndarray:
+    """
+    Rest-to-rest travel time over `distance` with a speed and acceleration limit.
+
+    Args:
+        distance: distances in meters (non-negative).
+        max_speed: speed limit(s) in m/s.
+        acceleration: acceleration limit(s) in m/s^2; 0 means instantaneous.
+
+    Returns:
+        float64 array of seconds.
+    """
+    distance = np.asarray(distance, dtype=np.float64)
+    max_speed = np.broadcast_to(np.asarray(max_speed, dtype=np.float64), distance.shape)
+    acceleration = np.broadcast_to(np.asarray(acceleration, dtype=np.float64), distance.shape)
+    cruise = distance / max_speed
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Distance spent accelerating plus decelerating to and from max_speed
+        ramp = max_speed * max_speed / acceleration
+        trapezoid = cruise + max_speed / acceleration
+        triangle = 2.0 * np.sqrt(distance / acceleration)
+    return np.where(acceleration > 0, np.where(distance >= ramp, trapezoid, triangle), cruise)
+
+
+def _forward_fill(values: np.ndarray, mask: np.ndarray, default: float) -> np.ndarray:
+    """Value of the last row (inclusive) where mask is set, or default before the first one."""
+    last = np.maximum.accumulate(np.where(mask, np.arange(len(values)), -1))
+    return np.where(last >= 0, values[np.maximum(last, 0)], default)
+
+
+def _kinematics(config: Dict) -> Dict:
+    kinematics = dict(config.get("kinematics") or {})
+    for key in ("default_speed_xy", "speed_up", "speed_down"):
+        value = kinematics.get(key)
+        kinematics[key] = 1.0 if value is None else float(value)
+        if kinematics[key] <= 0:
+            raise ValueError(f"kinematics.{key} must be greater than 0")
+    for key in ("acceleration_xy", "acceleration_z"):
+        kinematics[key] = float(kinematics.get(key) or 0.0)
+    return kinematics
+
+
+def simulate(arrays: CommandArrays, config: Dict) -> FlightTimeline:
+    """
+    Simulate normalized commands with trapezoidal velocity profiles.
+
+    Args:
+        arrays: commands from columnar.extract_command_arrays.
+        config: flight-time config; uses kinematics, command_delays_seconds and battery_time_minutes.
+
+    Returns:
+        FlightTimeline with one row per command.
+    """
+    kinematics = _kinematics(config)
+    n = len(arrays)
+    codes = arrays.type_codes.astype(np.intp)
+
+    # XY speed in force at each row: set by SET_SPEED, or by TAKEOFF's max_speed_xy
+    setters = np.isin(codes, (SET_SPEED, TAKEOFF)) & (arrays.speed > 0)
+    speed_xy = _forward_fill(arrays.speed, setters, kinematics["default_speed_xy"])
+    if kinematics.get("max_speed_xy"):
+        speed_xy = np.minimum(speed_xy, float(kinematics["max_speed_xy"]))
+
+    # Moves start where the previous move ended, from the origin like calculate_distances
+    moves = arrays.move_mask
+    dx = np.diff(arrays.x[moves], prepend=0.0)
+    dy = np.diff(arrays.y[moves], prepend=0.0)
+    dz = np.diff(arrays.z[moves], prepend=0.0)
+
+    horizontal = np.zeros(n)
+    climb = np.zeros(n)
+    descend = np.zeros(n)
+    horizontal[moves] = trapezoid_time(np.sqrt(dx * dx + dy * dy), speed_xy[moves], kinematics["acceleration_xy"])
+    climb[moves] = trapezoid_time(np.where(dz > 0, dz, 0.0), kinematics["speed_up"], kinematics["acceleration_z"])
+    descend[moves] = trapezoid_time(np.where(dz < 0, -dz, 0.0), kinematics["speed_down"], kinematics["acceleration_z"])
+
+    command_delays = config.get("command_delays_seconds", {})
+    delays = np.array([command_delays.get(name, 0.0) for name in COMMAND_TYPES], dtype=np.float64)
+    hover = np.where(codes == WAIT, arrays.duration, 0.0) + delays[codes]
+
+    seconds = hover + horizontal + climb + descend
+    end = np.cumsum(seconds)
+    start = end - seconds
+
+    power = kinematics.get("power_watts")
+    if power:
+        capacity_wh = kinematics.get("battery_capacity_wh")
+        if not capacity_wh or capacity_wh <= 0:
+            raise ValueError("kinematics.battery_capacity_wh must be set with power_watts")
+        watts = {phase: float(power.get(phase, power.get("hover", 0.0))) for phase in POWER_PHASES}
+        joules = (hover * watts["hover"] + horizontal * watts["horizontal"]
+                  + climb * watts["climb"] + descend * watts["descend"])
+        energy_wh = np.cumsum(joules) / 3600.0
+        battery_used = energy_wh / capacity_wh
+    else:
+        battery_seconds = _battery_seconds(config)
+        energy_wh = None
+        battery_used = end / battery_seconds
+
+    moving_seconds = float(horizontal.sum() + climb.sum() + descend.sum())
+    return FlightTimeline(arrays.type_codes, start, end, battery_used, energy_wh, moving_seconds)
+
+
+def _battery_seconds(config: Dict) -> float:
+    battery_time_min = config.get("battery_time_minutes")
+    if battery_time_min is None or battery_time_min <= 0:
+        raise ValueError("Config must include positive 'battery_time_minutes'")
+    return battery_time_min * 60.0
+
+
+def _landing_draw(config: Dict, landing_sec: float) -> float:
+    """Fraction of the battery used by the landing phase (hovering)."""
+    kinematics = config.get("kinematics") or {}
+    power = kinematics.get("power_watts")
+    if power:
+        return landing_sec * float(power.get("hover", 0.0)) / 3600.0 / kinematics["battery_capacity_wh"]
+    return landing_sec / _battery_seconds(config)
+
+
+def simulate_path(config: Dict, path_file: Union[str, Path], timeline: bool = False) -> Dict:
+    """
+    Estimate one path file with the kinematic simulator.
+
+    Returns the same fields as estimate_path, plus battery_used_percent (and
+    the per-command timeline records when `timeline` is set). average_speed
+    is the distance flown over the simulated travel time. is_enough_battery
+    compares the simulated battery draw, including the landing phase,
+    with the full battery.
+
+    Args:
+        config (dict): Parsed config (see load_config); its path_file is ignored.
+        path_file (str | Path): Path to the JSON or binary command file.
+        timeline (bool): Include the per-command timeline.
+
+    Returns:
+        dict: A dictionary containing the flight path analysis results.
+    """
+    battery_seconds = _battery_seconds(config)
+    arrays = extract_command_arrays(load_path(path_file))
+    result = simulate(arrays, config)
+
+    landing_sec = config.get("landing_phase_duration_minutes", 0) * 60
+    total_sec = result.duration + landing_sec
+    battery_used = (float(result.battery_used[-1]) if len(result) else 0.0) + _landing_draw(config, landing_sec)
+
+    distances = calculate_distances(arrays)
+    flown = distances["horizontal"] + distances["vertical_up"] + distances["vertical_down"]
+    avg_speed = flown / result.moving_seconds if result.moving_seconds > 0 else 0.0
+    results = {
+        "path_file": path_file,
+        "command_counts": get_commands_count(arrays),
+        "average_speed": f"{avg_speed:.2f}",
+        "distances_m": {
+            "horizontal": f"{distances['horizontal']:.2f}",
+            "vertical_up": f"{distances['vertical_up']:.2f}",
+            "vertical_down": f"{distances['vertical_down']:.2f}",
+        },
+        "flight_duration": _format_time(total_sec),
+        "max_flight_duration": _format_time(battery_seconds),
+        "battery_used_percent": f"{battery_used * 100:.1f}",
+        "is_enough_battery": battery_used <= 1.0,
+    }
+    if timeline:
+        results["timeline"] = result.to_records()
+    return results
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Awaitable, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_TIMEOUT_SECONDS = 5.0
+
+
+async def with_timeout(awaitable: Awaitable[T], timeout: Optional[float]) -> T:
+    """Await with a timeout in seconds (None waits forever); raises asyncio.TimeoutError when it expires."""
+    if timeout is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout)
+
+
+async def gather_bounded(calls: Iterable[Callable[[], Awaitable[T]]],
+                         max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                         timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS) -> List[T]:
+    """
+    Run coroutine factories concurrently, at most max_concurrency at a time.
+
+    Each call gets its own timeout, counted from when it starts running, not
+    from when it was queued. The first failure (including a timeout) is
+    raised after the calls that are already running have been cancelled.
+
+    Args:
+        calls: zero-argument functions returning awaitables.
+        max_concurrency: maximum number of calls in flight.
+        timeout: per-call timeout in seconds, None for no timeout.
+
+    Returns:
+        The results, in the order of calls.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await with_timeout(call(), timeout)
+
+    tasks = [asyncio.ensure_future(run(call)) for call in calls]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
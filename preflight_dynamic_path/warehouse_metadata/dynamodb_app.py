@@ -1,34 +1,229 @@
-import boto3
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
 
-def get_shelf_position(shelf_id: str, table_name: str = "Shelves"):
-    dynamodb = boto3.resource("dynamodb")
-    table = dynamodb.Table(table_name)
+from .async_utils import DEFAULT_MAX_CONCURRENCY, DEFAULT_TIMEOUT_SECONDS, gather_bounded, with_timeout
+from .shelf_cache import get_shelf_cache
+
+# DynamoDB allows at most 100 keys per BatchGetItem request
+BATCH_GET_LIMIT = 100
+MAX_BATCH_RETRIES = 8
+RETRY_BASE_DELAY_SECONDS = 0.05
+
+# Table behind get_shelf_cache("dynamodb")
+DEFAULT_TABLE_NAME = "Shelves"
+
+# Set DYNAMODB_ENDPOINT_URL to use DynamoDB Local or another stand-in
+ENDPOINT_URL_ENV = "DYNAMODB_ENDPOINT_URL"
+
+# Threads running blocking DynamoDB calls for the *_async functions
+ASYNC_WORKERS = int(os.environ.get("DYNAMODB_ASYNC_WORKERS", 32))
+
+_client = None
+_client_lock = threading.Lock()
+_deserializer = None
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_dynamodb_client():
+    """Return the shared (thread-safe) DynamoDB client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                try:
+                    import boto3
+                except ImportError:
+                    raise ImportError("The DynamoDB backend needs boto3: pip install -r requirements/dynamodb.txt") from None
+                _client = boto3.client("dynamodb", endpoint_url=os.environ.get(ENDPOINT_URL_ENV) or None)
+    return _client
+
+
+def reset_dynamodb_client():
+    """Forget the shared client so the next call creates a new one (e.g. after changing credentials)."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+def _deserialize(item: dict) -> dict:
+    global _deserializer
+    if _deserializer is None:
+        from boto3.dynamodb.types import TypeDeserializer
+
+        _deserializer = TypeDeserializer()
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+
+def _position_from_item(item: dict) -> dict:
+    position = item.get("position", {})
+    x = position.get("x")
+    y = position.get("y")
+    z = position.get("z")
+
+    return {
+        "x": int(x) if x is not None else None,
+        "y": int(y) if y is not None else None,
+        "z": int(z) if z is not None else None,
+    }
+
+
+def get_shelf_position(shelf_id: str, table_name: str = DEFAULT_TABLE_NAME, use_cache: bool = True):
+    """
+    Return the position of one shelf, or None for an unknown shelf.
+
+    Args:
+        shelf_id: The shelf ID to look up.
+        table_name: DynamoDB table name.
+        use_cache: Serve lookups in the default table from
+            get_shelf_cache("dynamodb"); False always queries DynamoDB.
+    """
+    if use_cache and table_name == DEFAULT_TABLE_NAME:
+        return get_shelf_cache("dynamodb").get(shelf_id)
+    return fetch_shelf_position(shelf_id, table_name)
+
+
+def get_shelf_positions(shelf_ids: Iterable[str], table_name: str = DEFAULT_TABLE_NAME,
+                        use_cache: bool = True) -> Dict[str, Optional[dict]]:
+    """
+    Return the positions of many shelves, keyed by shelf ID in input order
+    (None for unknown shelves).
+
+    Args:
+        shelf_ids: Shelf IDs to look up; duplicates are looked up once.
+        table_name: DynamoDB table name.
+        use_cache: Serve lookups in the default table from
+            get_shelf_cache("dynamodb"), which fetches only the misses;
+            False always queries DynamoDB.
+    """
+    if use_cache and table_name == DEFAULT_TABLE_NAME:
+        return get_shelf_cache("dynamodb").get_many(shelf_ids)
+    return fetch_shelf_positions(shelf_ids, table_name)
+
+
+def fetch_shelf_position(shelf_id: str, table_name: str = DEFAULT_TABLE_NAME):
+    client = get_dynamodb_client()
 
     try:
-        response = table.get_item(Key={"id": shelf_id})
+        response = client.get_item(TableName=table_name, Key={"id": {"S": shelf_id}})
         
         if "Item" not in response:
             print(f"Shelf with id '{shelf_id}' not found.")
             return None
             
-        item = response["Item"]
-
-        position = item.get("position", {})
-        x = position.get("x")
-        y = position.get("y")
-        z = position.get("z")
-
-        return {
-            "x": int(x) if x is not None else None,
-            "y": int(y) if y is not None else None,
-            "z": int(z) if z is not None else None,
-        }
+        return _position_from_item(_deserialize(response["Item"]))
 
     except Exception as e:
         print(f"Error fetching shelf: {e}")
         return None
 
 
+def fetch_shelf_positions(shelf_ids: Iterable[str], table_name: str = DEFAULT_TABLE_NAME) -> Dict[str, Optional[dict]]:
+    """
+    Fetch the positions of many shelves from DynamoDB with BatchGetItem.
+
+    Keys are requested 100 at a time; keys DynamoDB returns as unprocessed
+    are retried with exponential backoff.
+
+    Args:
+        shelf_ids: Shelf IDs to fetch; duplicates are fetched once.
+        table_name: DynamoDB table name.
+
+    Returns:
+        A dictionary keyed by shelf ID, in input order, with the same position
+        dictionaries as get_shelf_position (None for unknown shelves).
+
+    Raises:
+        RuntimeError: If some keys are still unprocessed after all retries.
+    """
+    ids = list(dict.fromkeys(shelf_ids))
+    positions: Dict[str, Optional[dict]] = dict.fromkeys(ids)
+    client = get_dynamodb_client()
+
+    for start in range(0, len(ids), BATCH_GET_LIMIT):
+        keys = [{"id": {"S": shelf_id}} for shelf_id in ids[start:start + BATCH_GET_LIMIT]]
+        request = {table_name: {"Keys": keys}}
+
+        for attempt in range(MAX_BATCH_RETRIES + 1):
+            response = client.batch_get_item(RequestItems=request)
+            for raw_item in response.get("Responses", {}).get(table_name, []):
+                item = _deserialize(raw_item)
+                positions[item["id"]] = _position_from_item(item)
+
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                break
+            time.sleep(RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+        else:
+            missing = len(request.get(table_name, {}).get("Keys", []))
+            raise RuntimeError(f"{missing} shelf keys still unprocessed after {MAX_BATCH_RETRIES} retries.")
+
+    return positions
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _client_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix="dynamodb")
+    return _executor
+
+
+async def _run_blocking(func, *args):
+    # boto3 clients are thread-safe, so the shared client is used from the pool threads
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args))
+
+
+async def get_shelf_position_async(shelf_id: str, table_name: str = DEFAULT_TABLE_NAME,
+                                   timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS):
+    """
+    Async equivalent of fetch_shelf_position (uncached), run on a thread pool.
+
+    Raises:
+        asyncio.TimeoutError: If the lookup takes longer than timeout seconds.
+            The call itself still finishes in its thread.
+    """
+    return await with_timeout(_run_blocking(fetch_shelf_position, shelf_id, table_name), timeout)
+
+
+async def get_shelf_positions_async(shelf_ids: Iterable[str], table_name: str = DEFAULT_TABLE_NAME,
+                                    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                                    timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS) -> Dict[str, Optional[dict]]:
+    """
+    Async equivalent of fetch_shelf_positions: the 100-key BatchGetItem
+    requests run concurrently on a thread pool, at most max_concurrency at a time.
+
+    Args:
+        shelf_ids: Shelf IDs to fetch; duplicates are fetched once.
+        table_name: DynamoDB table name.
+        max_concurrency: Maximum number of batches in flight.
+        timeout: Seconds allowed for each batch, retries included (None waits forever).
+
+    Returns:
+        A dictionary keyed by shelf ID, in input order (None for unknown shelves).
+
+    Raises:
+        asyncio.TimeoutError: If a batch takes longer than timeout.
+        RuntimeError: If some keys are still unprocessed after all retries.
+    """
+    ids = list(dict.fromkeys(shelf_ids))
+    positions: Dict[str, Optional[dict]] = dict.fromkeys(ids)
+    batches: List[List[str]] = [ids[start:start + BATCH_GET_LIMIT] for start in range(0, len(ids), BATCH_GET_LIMIT)]
+
+    results = await gather_bounded(
+        [lambda batch=batch: _run_blocking(fetch_shelf_positions, batch, table_name) for batch in batches],
+        max_concurrency=max_concurrency, timeout=timeout)
+    for batch_positions in results:
+        positions.update(batch_positions)
+    return positions
+
+
 if __name__ == "__main__":
     shelf_id = input("Enter shelf id: ").strip()
     pos = get_shelf_position(shelf_id)
@@ -0,0 +1,263 @@
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Union
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Every live cache, so the setters can invalidate all of them
+_caches = weakref.WeakSet()
+
+
+def _shelf_pattern(passage: str, column: Optional[str] = None, level: Optional[str] = None) -> str:
+    """SQL LIKE pattern matching the shelf IDs of a passage, optionally narrowed to a column and/or level."""
+    return f"{passage}{column or '__'}{level or '__'}%"
+
+
+def _matches(shelf_id: str, passage: str, column: Optional[str], level: Optional[str]) -> bool:
+    return (shelf_id[0:2] == passage
+            and (column is None or shelf_id[2:4] == column)
+            and (level is None or shelf_id[4:6] == level))
+
+
+class _DiskStore:
+    """Shared on-disk SQLite store of cached positions, usable from several processes."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS shelf_positions "
+                         "(id TEXT PRIMARY KEY, position TEXT NOT NULL, expires REAL NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, shelf_ids, now: float) -> Dict[str, tuple]:
+        """Unexpired entries as {shelf_id: (expires, position)}."""
+        found = {}
+        ids = list(shelf_ids)
+        with self._connect() as conn:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT id, position, expires FROM shelf_positions WHERE expires > ? AND id IN ({placeholders})",
+                    [now, *chunk])
+                found.update((shelf_id, (expires, json.loads(position))) for shelf_id, position, expires in rows)
+        return found
+
+    def put_many(self, entries: Dict[str, tuple]):
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO shelf_positions VALUES (?, ?, ?)",
+                             [(shelf_id, json.dumps(position), expires)
+                              for shelf_id, (expires, position) in entries.items()])
+
+    def delete_matching(self, pattern: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM shelf_positions WHERE id LIKE ?", (pattern,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM shelf_positions")
+
+
+class ShelfPositionCache:
+    """
+    Read-through cache of shelf positions in front of a metadata backend.
+
+    Lookups are served from an in-process LRU with a TTL, then from an
+    optional on-disk SQLite store shared between processes, and only then
+    from the backend. Unknown shelves (None) are not cached. The shelf
+    setters in aurora_app invalidate affected entries in every live cache.
+
+    Args:
+        fetch_one: backend lookup for one shelf ID, returning a position dict or None.
+        fetch_many: optional bulk lookup returning {shelf_id: position or None}.
+        ttl_seconds: how long a cached position stays valid.
+        max_entries: maximum number of positions kept in memory.
+        store_path: optional SQLite file for the shared on-disk store.
+    """
+
+    def __init__(self, fetch_one: Callable[[str], Optional[dict]],
+                 fetch_many: Optional[Callable[[Iterable[str]], Dict[str, Optional[dict]]]] = None,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 store_path: Optional[Union[str, Path]] = None):
+        self.fetch_one = fetch_one
+        self.fetch_many = fetch_many
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.store = _DiskStore(store_path) if store_path else None
+
+        self._lock = threading.Lock()
+        # Orders store writes against invalidate()'s store deletes
+        self._store_lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Bumped by invalidate() and clear(); positions read across either are not stored
+        self._generation = 0
+        self._counters = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0,
+                          "backend_calls": 0, "invalidations": 0}
+        _caches.add(self)
+
+    def _lookup_memory(self, shelf_id: str, now: float) -> Optional[dict]:
+        entry = self._entries.get(shelf_id)
+        if entry is None:
+            return None
+        expires, position = entry
+        if expires <= now:
+            del self._entries[shelf_id]
+            return None
+        self._entries.move_to_end(shelf_id)
+        return position
+
+    def _remember(self, entries: Dict[str, tuple], generation: int, write_store: bool = True):
+        """
+        Cache {shelf_id: (expires, position)} entries read during `generation`,
+        unless an invalidation has happened since.
+        """
+        if not entries:
+            return
+        with self._lock:
+            if self._generation != generation:
+                return
+            for shelf_id, entry in entries.items():
+                self._entries[shelf_id] = entry
+                self._entries.move_to_end(shelf_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if write_store and self.store is not None:
+            with self._store_lock:
+                # invalidate() bumps the generation before deleting from the store
+                if self._generation == generation:
+                    self.store.put_many(entries)
+
+    def get(self, shelf_id: str) -> Optional[dict]:
+        """Return the position of one shelf, going to the backend only on a miss."""
+        return self.get_many([shelf_id])[shelf_id]
+
+    def get_many(self, shelf_ids: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """
+        Return the positions of many shelves, keyed by shelf ID in input order.
+
+        Misses are fetched with fetch_many when available, otherwise one by one.
+        """
+        ids = list(dict.fromkeys(shelf_ids))
+        now = time.time()
+        positions: Dict[str, Optional[dict]] = dict.fromkeys(ids)
+
+        missing = []
+        with self._lock:
+            generation = self._generation
+            for shelf_id in ids:
+                position = self._lookup_memory(shelf_id, now)
+                if position is None:
+                    missing.append(shelf_id)
+                else:
+                    positions[shelf_id] = position
+            self._counters["memory_hits"] += len(ids) - len(missing)
+
+        if missing and self.store is not None:
+            from_disk = self.store.get_many(missing, now)
+            if from_disk:
+                positions.update((shelf_id, position) for shelf_id, (_, position) in from_disk.items())
+                # Keep the stored expiry so promoted entries do not outlive their TTL
+                self._remember(from_disk, generation, write_store=False)
+                missing = [shelf_id for shelf_id in missing if shelf_id not in from_disk]
+            with self._lock:
+                self._counters["disk_hits"] += len(from_disk)
+
+        if missing:
+            if self.fetch_many is not None:
+                fetched = self.fetch_many(missing)
+                backend_calls = 1
+            else:
+                fetched = {shelf_id: self.fetch_one(shelf_id) for shelf_id in missing}
+                backend_calls = len(missing)
+            found = {shelf_id: position for shelf_id, position in fetched.items() if position is not None}
+            positions.update(found)
+            expires = now + self.ttl_seconds
+            self._remember({shelf_id: (expires, position) for shelf_id, position in found.items()}, generation)
+            with self._lock:
+                self._counters["backend_calls"] += backend_calls
+
+        with self._lock:
+            self._counters["misses"] += len(missing)
+            self._counters["hits"] += len(ids) - len(missing)
+        # Hand out copies so callers cannot modify cached entries
+        return {shelf_id: dict(position) if position is not None else None
+                for shelf_id, position in positions.items()}
+
+    def invalidate(self, passage: str, column: Optional[str] = None, level: Optional[str] = None):
+        """Drop the cached positions of a passage, optionally narrowed to a column and/or level."""
+        with self._lock:
+            for shelf_id in [s for s in self._entries if _matches(s, passage, column, level)]:
+                del self._entries[shelf_id]
+            self._generation += 1
+            self._counters["invalidations"] += 1
+        if self.store is not None:
+            with self._store_lock:
+                self.store.delete_matching(_shelf_pattern(passage, column, level))
+
+    def clear(self):
+        """Drop every cached position, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+        if self.store is not None:
+            with self._store_lock:
+                self.store.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the hit/miss counters:
+          - hits: lookups answered from memory or disk
+          - memory_hits, disk_hits: split of the hits by layer
+          - misses: lookups that went to the backend
+          - backend_calls: requests made to the backend
+          - invalidations: invalidate() calls
+          - entries: positions currently held in memory
+        """
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries)}
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self._counters:
+                self._counters[key] = 0
+
+
+def invalidate_shelves(passage: str, column: Optional[str] = None, level: Optional[str] = None):
+    """Invalidate a passage (optionally a column and/or level) in every live ShelfPositionCache."""
+    for cache in list(_caches):
+        cache.invalidate(passage, column, level)
+
+
+_default_caches: Dict[str, ShelfPositionCache] = {}
+_default_lock = threading.Lock()
+
+
+def get_shelf_cache(backend: str = "aurora", **options) -> ShelfPositionCache:
+    """
+    Return the process-wide cache for a backend ("aurora" or "dynamodb").
+
+    The cache is created on the first call; options (ttl_seconds,
+    max_entries, store_path) only apply then.
+    """
+    if backend not in _default_caches:
+        with _default_lock:
+            if backend not in _default_caches:
+                if backend == "aurora":
+                    from . import aurora_app as app
+                elif backend == "dynamodb":
+                    from . import dynamodb_app as app
+                else:
+                    raise ValueError(f"Unknown shelf backend '{backend}'.")
+                _default_caches[backend] = ShelfPositionCache(app.fetch_shelf_position, app.fetch_shelf_positions,
+                                                              **options)
+    return _default_caches[backend]
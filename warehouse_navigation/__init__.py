@@ -1,14 +1,91 @@
-from .graph_builder import load_warehouse_map, build_graph, shortest_path, plot_path, find_closest_node
-from .path_builder import generate_drone_path
+from importlib import import_module
+
+from .graph_builder import load_warehouse_map, build_graph, shortest_path, plot_path, find_closest_node, load_passage_yaml, \
+    set_edge_weights, traversal_time, euclidean_heuristic, build_graph_from_rows
+from .path_builder import generate_drone_path, iter_drone_path, write_drone_path
+from .path_optimizer import compact_drone_path, schedule_seconds
+from .yaml_index import YamlAssetIndex, get_yaml_index
+from .route_planner import plan_routes
+from .sortie_planner import plan_sorties, stops_from_commands, station_node, battery_budget_seconds, \
+    load_drone_stations
 from .warehouse_map_generator import generate_warehouse_map, save_warehouse_map
 
+# Names whose modules need NumPy, PyYAML or SQLAlchemy: imported on first access
+_LAZY_EXPORTS = {
+    "CompactGraph": ".compact_graph",
+    "build_compact_graph": ".compact_graph",
+    "save_graph_snapshot": ".graph_snapshot",
+    "load_graph_snapshot": ".graph_snapshot",
+    "SpatialIndex": ".spatial_index",
+    "build_spatial_index": ".spatial_index",
+    "BarcodeMap": ".barcode_map",
+    "parse_barcode_yaml": ".barcode_map",
+    "load_barcode_map": ".barcode_map",
+    "load_passage_barcode_map": ".barcode_map",
+    "RouteTable": ".route_table",
+    "build_route_table": ".route_table",
+    "load_route_table": ".route_table",
+    "load_graph_from_db": ".waypoint_loader",
+    "ObstacleLayer": ".obstacles",
+    "build_obstacle_layer": ".obstacles",
+    "load_obstacles_from_db": ".obstacles",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = [
     "load_warehouse_map",
     "build_graph",
     "shortest_path",
     "plot_path",
     "find_closest_node",
+    "load_passage_yaml",
+    "set_edge_weights",
+    "traversal_time",
+    "euclidean_heuristic",
+    "build_graph_from_rows",
+    "CompactGraph",
+    "build_compact_graph",
+    "save_graph_snapshot",
+    "load_graph_snapshot",
     "generate_drone_path",
+    "iter_drone_path",
+    "write_drone_path",
+    "compact_drone_path",
+    "schedule_seconds",
+    "SpatialIndex",
+    "build_spatial_index",
+    "YamlAssetIndex",
+    "get_yaml_index",
+    "BarcodeMap",
+    "parse_barcode_yaml",
+    "load_barcode_map",
+    "load_passage_barcode_map",
+    "RouteTable",
+    "build_route_table",
+    "load_route_table",
+    "plan_routes",
+    "plan_sorties",
+    "stops_from_commands",
+    "station_node",
+    "battery_budget_seconds",
+    "load_drone_stations",
+    "load_graph_from_db",
+    "ObstacleLayer",
+    "build_obstacle_layer",
+    "load_obstacles_from_db",
     "generate_warehouse_map",
     "save_warehouse_map"
 ]
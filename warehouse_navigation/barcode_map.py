@@ -0,0 +1,242 @@
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import yaml
+
+from .yaml_index import get_yaml_index
+
+BARCODE_CACHE_SUFFIX = ".barcodes.npz"
+BARCODE_CACHE_VERSION = 1
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class BarcodeMap:
+    """
+    Columnar model of a passage YAML code file.
+
+    Each row is one entry of a `codes` list. Strings are interned: code_ids,
+    type_ids and group_ids index into code_table, type_table and group_table.
+
+    Attributes:
+        code_table: list of code strings.
+        type_table: list of barcode types (e.g. "Code 128").
+        group_table: list of the top-level sections the codes belong to (e.g. "hires2").
+        code_ids, type_ids, group_ids: int32 arrays of length N.
+        position: float64 array of shape (N, 3).
+        orientation: float64 array of shape (N, 3).
+        dim: float64 array of shape (N, 2).
+        fix_y: float64 array of length N.
+    """
+
+    def __init__(self, code_table: List[str], type_table: List[str], group_table: List[str],
+                 code_ids: np.ndarray, type_ids: np.ndarray, group_ids: np.ndarray,
+                 position: np.ndarray, orientation: np.ndarray, dim: np.ndarray, fix_y: np.ndarray):
+        self.code_table = list(code_table)
+        self.type_table = list(type_table)
+        self.group_table = list(group_table)
+        self.code_ids = code_ids
+        self.type_ids = type_ids
+        self.group_ids = group_ids
+        self.position = position
+        self.orientation = orientation
+        self.dim = dim
+        self.fix_y = fix_y
+
+        # code -> first row holding it
+        self.code_index: Dict[str, int] = {}
+        for row, code_id in enumerate(code_ids.tolist()):
+            self.code_index.setdefault(self.code_table[code_id], row)
+
+    def __len__(self) -> int:
+        return len(self.code_ids)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.code_index
+
+    def row(self, code: str) -> int:
+        """Return the row index of a code."""
+        try:
+            return self.code_index[code]
+        except KeyError:
+            raise KeyError(f"Code {code} not in barcode map.") from None
+
+    def get(self, code: str) -> Optional[Dict]:
+        """Return one code entry as a dictionary in the YAML layout, or None if it is unknown."""
+        row = self.code_index.get(code)
+        if row is None:
+            return None
+        return self.record(row)
+
+    def record(self, row: int) -> Dict:
+        """Return the entry at `row` as a dictionary in the YAML layout."""
+        return {
+            "Dim": self.dim[row].tolist(),
+            "Orientation": self.orientation[row].tolist(),
+            "Position": self.position[row].tolist(),
+            "Type": self.type_table[self.type_ids[row]],
+            "code": self.code_table[self.code_ids[row]],
+            "fix_y": self.fix_y[row].item(),
+        }
+
+    def codes(self) -> List[str]:
+        """Return the code string of every row."""
+        return [self.code_table[i] for i in self.code_ids.tolist()]
+
+    def save(self, path: Union[str, Path], source_hash: str = "") -> Path:
+        """Save the map as an .npz file tagged with the hash of its source file."""
+        path = Path(path)
+        with path.open("wb") as f:
+            np.savez(
+                f,
+                version=np.array(BARCODE_CACHE_VERSION),
+                source_hash=np.array(source_hash),
+                code_table=np.array(self.code_table, dtype=str),
+                type_table=np.array(self.type_table, dtype=str),
+                group_table=np.array(self.group_table, dtype=str),
+                code_ids=self.code_ids,
+                type_ids=self.type_ids,
+                group_ids=self.group_ids,
+                position=self.position,
+                orientation=self.orientation,
+                dim=self.dim,
+                fix_y=self.fix_y,
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], source_hash: Optional[str] = None) -> Optional["BarcodeMap"]:
+        """
+        Load a map written by save().
+
+        Returns:
+            The map, or None if the file has another format version or,
+            when source_hash is given, was built from a different source file.
+        """
+        with np.load(Path(path), allow_pickle=False) as data:
+            if int(data["version"]) != BARCODE_CACHE_VERSION:
+                return None
+            if source_hash is not None and str(data["source_hash"]) != source_hash:
+                return None
+            return cls(
+                data["code_table"].tolist(), data["type_table"].tolist(), data["group_table"].tolist(),
+                data["code_ids"], data["type_ids"], data["group_ids"],
+                data["position"], data["orientation"], data["dim"], data["fix_y"],
+            )
+
+
+def _strip_directive(text: str) -> str:
+    # The files start with an OpenCV-style "%YAML:1.0" directive that PyYAML rejects
+    if text.startswith("%YAML:"):
+        return text.split("\n", 1)[1] if "\n" in text else ""
+    return text
+
+
+def _intern(table: Dict[str, int], value: str) -> int:
+    index = table.get(value)
+    if index is None:
+        index = table[value] = len(table)
+    return index
+
+
+def parse_barcode_yaml(text: str) -> BarcodeMap:
+    """
+    Parse the content of a passage YAML code file into a BarcodeMap.
+
+    Args:
+        text: file content, e.g. as returned by load_passage_yaml.
+
+    Returns:
+        BarcodeMap with one row per code entry.
+    """
+    data = yaml.load(_strip_directive(text), Loader=_Loader) or {}
+
+    codes, types, groups = {}, {}, {}
+    code_ids, type_ids, group_ids = [], [], []
+    position, orientation, dim, fix_y = [], [], [], []
+
+    for group, section in data.items():
+        entries = section.get("codes", []) if isinstance(section, dict) else []
+        group_id = _intern(groups, str(group))
+        for entry in entries:
+            code_ids.append(_intern(codes, str(entry["code"])))
+            type_ids.append(_intern(types, str(entry.get("Type", ""))))
+            group_ids.append(group_id)
+            position.append(entry.get("Position", (0.0, 0.0, 0.0)))
+            orientation.append(entry.get("Orientation", (0.0, 0.0, 0.0)))
+            dim.append(entry.get("Dim", (0.0, 0.0)))
+            fix_y.append(entry.get("fix_y", 0.0))
+
+    return BarcodeMap(
+        list(codes), list(types), list(groups),
+        np.array(code_ids, dtype=np.int32),
+        np.array(type_ids, dtype=np.int32),
+        np.array(group_ids, dtype=np.int32),
+        np.array(position, dtype=np.float64).reshape(-1, 3),
+        np.array(orientation, dtype=np.float64).reshape(-1, 3),
+        np.array(dim, dtype=np.float64).reshape(-1, 2),
+        np.array(fix_y, dtype=np.float64),
+    )
+
+
+def barcode_cache_path(yaml_path: Union[str, Path]) -> Path:
+    """Return the binary sidecar for a YAML code file (rami_st1_17_13.barcodes.npz)."""
+    yaml_path = Path(yaml_path)
+    return yaml_path.with_name(yaml_path.stem + BARCODE_CACHE_SUFFIX)
+
+
+def load_barcode_map(yaml_path: Union[str, Path], use_cache: bool = True) -> BarcodeMap:
+    """
+    Load a passage YAML code file as a BarcodeMap.
+
+    The parsed result is cached in a binary sidecar next to the file, keyed by
+    the file's SHA-256, so later loads skip YAML parsing. If the sidecar cannot
+    be written (e.g. read-only data directory) the map is still returned.
+
+    Args:
+        yaml_path: path to the YAML file.
+        use_cache: read and write the binary sidecar.
+
+    Returns:
+        BarcodeMap for the file.
+    """
+    yaml_path = Path(yaml_path)
+    if not yaml_path.exists():
+        raise FileNotFoundError(f"Barcode file not found: {yaml_path}")
+
+    raw = yaml_path.read_bytes()
+    source_hash = hashlib.sha256(raw).hexdigest()
+    cache_path = barcode_cache_path(yaml_path)
+
+    if use_cache and cache_path.exists():
+        try:
+            cached = BarcodeMap.load(cache_path, source_hash=source_hash)
+        except (OSError, KeyError, ValueError):
+            cached = None
+        if cached is not None:
+            return cached
+
+    barcode_map = parse_barcode_yaml(raw.decode("utf-8"))
+
+    if use_cache:
+        try:
+            barcode_map.save(cache_path, source_hash=source_hash)
+        except OSError:
+            pass
+    return barcode_map
+
+
+def load_passage_barcode_map(start_passage: Union[str, int], end_passage: Union[str, int],
+                             use_cache: bool = True) -> Optional[BarcodeMap]:
+    """
+    Load the BarcodeMap for the route between two passages.
+
+    Returns:
+        The BarcodeMap, or None if there is no YAML file for the passages.
+    """
+    path = get_yaml_index().find(start_passage, end_passage)
+    if path is None:
+        return None
+    return load_barcode_map(path, use_cache=use_cache)
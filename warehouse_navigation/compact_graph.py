@@ -0,0 +1,257 @@
+from collections import defaultdict
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .graph_builder import load_passage_yaml
+
+
+class CompactGraph:
+    """
+    Integer-indexed warehouse graph backed by flat NumPy arrays.
+
+    Nodes are numbered 0..N-1 in the same order build_graph adds them.
+    Adjacency is stored in CSR form: the neighbors of node i are
+    indices[indptr[i]:indptr[i + 1]]. String node IDs ("P{pid}_W{order}")
+    are only produced at the API edge.
+
+    Attributes:
+        node_ids: list of string node IDs, indexed by node number.
+        pos: float64 array of shape (N, 3) with node positions.
+        passage: int array with each node's passage ID.
+        order: int array with each node's order within its passage.
+        is_intersection: bool array.
+        is_entrance: bool array.
+        indptr: int array of length N + 1.
+        indices: int array with the target node of each edge.
+    """
+
+    def __init__(self, node_ids: List[str], pos: np.ndarray, passage: np.ndarray, order: np.ndarray,
+                 is_intersection: np.ndarray, is_entrance: np.ndarray,
+                 indptr: np.ndarray, indices: np.ndarray):
+        self.node_ids = list(node_ids)
+        self.pos = pos
+        self.passage = passage
+        self.order = order
+        self.is_intersection = is_intersection
+        self.is_entrance = is_entrance
+        self.indptr = indptr
+        self.indices = indices
+
+    # The lookup structures below are built on first use, so a graph loaded
+    # from a memory-mapped snapshot does not copy its arrays until it searches.
+
+    @cached_property
+    def index(self) -> Dict[str, int]:
+        return {node: i for i, node in enumerate(self.node_ids)}
+
+    @cached_property
+    def _indptr(self) -> List[int]:
+        # Flat Python views for the pure-Python search loop; indexing these is
+        # much cheaper than indexing NumPy scalars one at a time.
+        return self.indptr.tolist()
+
+    @cached_property
+    def _indices(self) -> List[int]:
+        return self.indices.tolist()
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def node_index(self, node_id: str) -> int:
+        """Return the integer index of a string node ID."""
+        try:
+            return self.index[node_id]
+        except KeyError:
+            raise KeyError(f"Node {node_id} not in graph.") from None
+
+    def neighbors(self, i: int) -> np.ndarray:
+        """Return the indices of the nodes reachable from node i in one hop."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def index_path(self, start: int, end: int) -> List[int]:
+        """
+        Breadth-first shortest path (fewest hops) between two node indices.
+
+        Raises:
+            ValueError: If end is not reachable from start.
+        """
+        if start == end:
+            return [start]
+
+        indptr, indices = self._indptr, self._indices
+        parent = [-1] * len(self.node_ids)
+        parent[start] = start
+        frontier = [start]
+
+        while frontier:
+            next_frontier = []
+            for u in frontier:
+                for k in range(indptr[u], indptr[u + 1]):
+                    v = indices[k]
+                    if parent[v] != -1:
+                        continue
+                    parent[v] = u
+                    if v == end:
+                        path = [end]
+                        while path[-1] != start:
+                            path.append(parent[path[-1]])
+                        path.reverse()
+                        return path
+                    next_frontier.append(v)
+            frontier = next_frontier
+
+        raise ValueError(f"No path between {self.node_ids[start]} and {self.node_ids[end]}.")
+
+    def shortest_path(self, start: str, end: str, return_coords: bool = False) -> Tuple[List, Optional[str]]:
+        """
+        Compact-graph equivalent of graph_builder.shortest_path.
+
+        Args:
+            start: starting node ID.
+            end: ending node ID.
+            return_coords: if True, return list of coordinates instead of node IDs.
+
+        Returns:
+            Tuple[List, Optional[str]]: A tuple containing:
+                - List of node IDs or list of coordinates along the path.
+                - The content of the loaded YAML file as a string, or None if not found.
+        """
+        path = self.index_path(self.node_index(start), self.node_index(end))
+        loaded_yaml_content = load_passage_yaml(str(self.passage[path[0]]), str(self.passage[path[-1]]))
+
+        if return_coords:
+            return self.coordinates(path), loaded_yaml_content
+        return [self.node_ids[i] for i in path], loaded_yaml_content
+
+    def coordinates(self, path: Sequence[int]) -> List[Tuple[float, float, float]]:
+        """Return the (x, y, z) tuples for a path of node indices, ready for generate_drone_path."""
+        return [tuple(p) for p in self.pos[list(path)].tolist()]
+
+    def find_closest_node(self, target_pos: Tuple[float, float, float]) -> Dict:
+        """
+        Compact-graph equivalent of graph_builder.find_closest_node.
+
+        Returns:
+            Dictionary with node_id, pos and distance of the closest node.
+        """
+        dist = np.linalg.norm(self.pos - np.asarray(target_pos, dtype=np.float64), axis=1)
+        i = int(np.argmin(dist))
+        return {"node_id": self.node_ids[i], "pos": tuple(self.pos[i].tolist()), "distance": float(dist[i])}
+
+    def to_networkx(self):
+        """
+        Convert back into the networkx DiGraph build_graph returns.
+
+        Returns:
+            (G, pos_to_node) as returned by build_graph.
+        """
+        import networkx as nx
+
+        from .graph_builder import set_edge_weights
+
+        G = nx.DiGraph()
+        pos_to_node = {}
+        rows = zip(self.node_ids, map(tuple, self.pos.tolist()), self.passage.tolist(), self.order.tolist(),
+                   self.is_intersection.tolist(), self.is_entrance.tolist())
+        for node_id, pos, passage, order, is_intersection, is_entrance in rows:
+            G.add_node(node_id, pos=pos, passage_id=str(passage), order=order,
+                       is_intersection=is_intersection, is_entrance=is_entrance)
+            pos_to_node[pos] = node_id
+
+        indptr, indices = self._indptr, self._indices
+        for u, node_id in enumerate(self.node_ids):
+            for k in range(indptr[u], indptr[u + 1]):
+                G.add_edge(node_id, self.node_ids[indices[k]])
+
+        set_edge_weights(G)
+        return G, pos_to_node
+
+    @classmethod
+    def from_networkx(cls, G) -> "CompactGraph":
+        """Convert a graph built by build_graph into a CompactGraph."""
+        node_ids = list(G.nodes)
+        index = {node: i for i, node in enumerate(node_ids)}
+        data = [G.nodes[node] for node in node_ids]
+        edges = [(index[u], index[v]) for u, v in G.edges]
+        return cls(
+            node_ids,
+            np.array([d["pos"] for d in data], dtype=np.float64).reshape(-1, 3),
+            np.array([int(d["passage_id"]) for d in data], dtype=np.int32),
+            np.array([d["order"] for d in data], dtype=np.int32),
+            np.array([d["is_intersection"] for d in data], dtype=bool),
+            np.array([d["is_entrance"] for d in data], dtype=bool),
+            *_to_csr(len(node_ids), edges),
+        )
+
+
+def _to_csr(num_nodes: int, edges: List[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert an edge list of (source, target) index pairs into CSR indptr/indices arrays."""
+    edge_array = np.array(edges, dtype=np.int32).reshape(-1, 2)
+    # Stable sort by source keeps each node's neighbors in insertion order
+    edge_array = edge_array[np.argsort(edge_array[:, 0], kind="stable")]
+    counts = np.bincount(edge_array[:, 0], minlength=num_nodes)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int32)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, edge_array[:, 1].copy()
+
+
+def build_compact_graph(passages: List[Dict]) -> CompactGraph:
+    """
+    Build a CompactGraph straight from warehouse map passages, without networkx.
+
+    Node numbering and edges match build_graph: points are grouped by passage,
+    sorted by order and linked to their neighbors, and the intersection points
+    of consecutive passages are linked to each other.
+
+    Args:
+        passages: flat list of passage points from load_warehouse_map.
+
+    Returns:
+        CompactGraph for the map.
+    """
+    passages_by_id = defaultdict(list)
+    for p in passages:
+        passages_by_id[p["passage_id"]].append(p)
+
+    points = []
+    first_index = {}
+    for pid, group in passages_by_id.items():
+        group.sort(key=lambda x: x["order"])
+        first_index[pid] = len(points)
+        points.extend(group)
+
+    edges = []
+    for pid, group in passages_by_id.items():
+        base = first_index[pid]
+        for i in range(len(group)):
+            if i > 0:
+                edges.append((base + i, base + i - 1))  # backward
+            if i < len(group) - 1:
+                edges.append((base + i, base + i + 1))  # forward
+
+    # Intersection jumps between consecutive passages
+    sorted_passage_ids = sorted(passages_by_id.keys(), key=int)
+    for pid_curr, pid_next in zip(sorted_passage_ids, sorted_passage_ids[1:]):
+        i_curr = first_index[pid_curr] + next(
+            i for i, p in enumerate(passages_by_id[pid_curr]) if p["is_intersection"])
+        i_next = first_index[pid_next] + next(
+            i for i, p in enumerate(passages_by_id[pid_next]) if p["is_intersection"])
+        edges.append((i_curr, i_next))
+        edges.append((i_next, i_curr))
+
+    return CompactGraph(
+        [f"P{p['passage_id']}_W{p['order']}" for p in points],
+        np.array([(p["position_x"], p["position_y"], p.get("position_z", 0)) for p in points],
+                 dtype=np.float64).reshape(-1, 3),
+        np.array([int(p["passage_id"]) for p in points], dtype=np.int32),
+        np.array([p["order"] for p in points], dtype=np.int32),
+        np.array([p["is_intersection"] for p in points], dtype=bool),
+        np.array([p["is_entrance"] for p in points], dtype=bool),
+        *_to_csr(len(points), edges),
+    )
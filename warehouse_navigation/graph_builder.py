@@ -1,12 +1,10 @@
 import json
 from pathlib import Path
-from typing import Union, List, Dict, Tuple, Optional
+from typing import Iterable, Union, List, Dict, Tuple, Optional
 import networkx as nx
-import matplotlib.pyplot as plt
 from collections import defaultdict
 from math import sqrt
-import glob
-from pathlib import Path
+from .yaml_index import get_yaml_index
 
 def load_warehouse_map(path: Union[str, Path]) -> List[Dict]:
     """Load warehouse map from JSON file (flat list of passage points)."""
@@ -70,9 +68,179 @@ def build_graph(passages: List[Dict]):
         G.add_edge(node_curr, node_next) # forward
         G.add_edge(node_next, node_curr) # backward
 
+    set_edge_weights(G)
+
+    return G, pos_to_node
+
+def build_graph_from_rows(rows: Iterable[Tuple]):
+    """
+    Build the same graph as build_graph from waypoint rows, in a single pass.
+
+    Args:
+        rows: (passage_id, order, position_x, position_y, position_z,
+              is_intersection, is_entrance) tuples sorted by (passage_id, order),
+              e.g. straight from a database cursor.
+
+    Returns:
+        (G, pos_to_node) as returned by build_graph.
+    """
+    G = nx.DiGraph()
+    pos_to_node = {}
+    intersections = {}  # passage_id -> its first intersection node
+
+    prev_pid = prev_node = None
+    for pid, order, x, y, z, is_intersection, is_entrance in rows:
+        node_id = f"P{pid}_W{order}"
+        pos = (x, y, z if z is not None else 0)
+        G.add_node(node_id, pos=pos,
+                   passage_id=pid,
+                   order=order,
+                   is_intersection=is_intersection,
+                   is_entrance=is_entrance)
+        pos_to_node[pos] = node_id
+
+        # Rows arrive in order, so each waypoint links to the previous one of its passage
+        if pid == prev_pid:
+            G.add_edge(prev_node, node_id)  # forward
+            G.add_edge(node_id, prev_node)  # backward
+        if is_intersection and pid not in intersections:
+            intersections[pid] = node_id
+        prev_pid, prev_node = pid, node_id
+
+    passage_ids = sorted({G.nodes[node]["passage_id"] for node in G}, key=int)
+    for curr_pid, next_pid in zip(passage_ids, passage_ids[1:]):
+        for pid in (curr_pid, next_pid):
+            if pid not in intersections:
+                raise ValueError(f"Passage {pid} has no intersection waypoint.")
+        G.add_edge(intersections[curr_pid], intersections[next_pid])  # forward
+        G.add_edge(intersections[next_pid], intersections[curr_pid])  # backward
+
+    set_edge_weights(G)
+
     return G, pos_to_node
 
-def shortest_path(G: nx.DiGraph, start: str, end: str, return_coords: bool = False) -> Tuple[List, Optional[str]]:
+def traversal_time(horizontal: float, dz: float, speed: float = 1.0, factors: Optional[Dict] = None,
+                   command_delays: Optional[Dict] = None, wait_period: float = 0.0) -> float:
+    """
+    Estimate the seconds needed to fly one edge, using the flight-time cost model.
+
+    Args:
+        horizontal: XY distance in meters.
+        dz: vertical delta in meters (positive is up).
+        speed: flight speed in m/s.
+        factors: calibration factors (horizontal, vertical_up, vertical_down, wait).
+        command_delays: per-command delays in seconds (MOVE_XY, MOVE_Z, ...).
+        wait_period: wait after each movement command, in seconds.
+
+    Returns:
+        Estimated traversal time in seconds.
+    """
+    factors = factors or {}
+    command_delays = command_delays or {}
+
+    seconds = horizontal / speed * factors.get("horizontal", 1.0)
+    if dz > 0:
+        seconds += dz / speed * factors.get("vertical_up", 1.0)
+    elif dz < 0:
+        seconds += -dz / speed * factors.get("vertical_down", 1.0)
+
+    # generate_drone_path emits one move (plus a wait) per axis that changes
+    moves = []
+    if horizontal > 0:
+        moves.append("MOVE_XY")
+    if dz != 0:
+        moves.append("MOVE_Z")
+    for move in moves:
+        seconds += command_delays.get(move, 0.0)
+        if wait_period:
+            seconds += wait_period * factors.get("wait", 1.0) + command_delays.get("WAIT", 0.0)
+
+    return seconds
+
+def set_edge_weights(G: nx.DiGraph, config: Optional[Dict] = None, speed: float = 1.0,
+                     wait_period: float = 0.0) -> nx.DiGraph:
+    """
+    Store metric weights on every edge of the graph:
+      - length: Euclidean length in meters
+      - dz: vertical delta in meters (positive is up)
+      - time: estimated traversal time in seconds (see traversal_time)
+
+    Args:
+        G: networkx DiGraph built by build_graph.
+        config: flight-time config (as returned by load_config) providing
+            calibration.speeds and command_delays_seconds; plain motion time if omitted.
+        speed: flight speed in m/s used to pick the calibration factors.
+        wait_period: wait after each movement command, in seconds.
+
+    Returns:
+        The same graph, updated in place.
+    """
+    if speed <= 0:
+        raise ValueError("Flight speed must be greater than 0")
+
+    # Imported here: the flight_time package pulls in PyYAML
+    from preflight_dynamic_path.flight_time.calculations import calibration_factors
+
+    config = config or {}
+    factors = calibration_factors(config, speed)
+    command_delays = config.get("command_delays_seconds", {})
+
+    for u, v, data in G.edges(data=True):
+        x1, y1, z1 = G.nodes[u]["pos"]
+        x2, y2, z2 = G.nodes[v]["pos"]
+        horizontal = sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        dz = z2 - z1
+        data["length"] = sqrt(horizontal**2 + dz**2)
+        data["dz"] = dz
+        data["time"] = traversal_time(horizontal, dz, speed, factors, command_delays, wait_period)
+
+    # Weights changed; drop cached A* heuristic scales
+    for key in [k for k in G.graph if k.startswith("_heuristic_scale_")]:
+        del G.graph[key]
+
+    return G
+
+def _heuristic_scale(G: nx.DiGraph, weight: str) -> float:
+    """
+    Smallest weight per meter of Euclidean edge length over all edges.
+    Scaling the straight-line distance by it never overestimates the
+    remaining cost, so the A* heuristic stays admissible.
+    """
+    key = f"_heuristic_scale_{weight}"
+    if key not in G.graph:
+        ratios = [data.get(weight, 1) / data["length"]
+                  for _, _, data in G.edges(data=True) if data.get("length", 0) > 0]
+        G.graph[key] = max(0.0, min(ratios)) if ratios else 0.0
+    return G.graph[key]
+
+def euclidean_heuristic(G: nx.DiGraph, weight: str = "length"):
+    """Return an admissible A* heuristic for the given edge weight."""
+    scale = _heuristic_scale(G, weight)
+
+    def heuristic(u: str, v: str) -> float:
+        x1, y1, z1 = G.nodes[u]["pos"]
+        x2, y2, z2 = G.nodes[v]["pos"]
+        return sqrt((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2) * scale
+
+    return heuristic
+
+def load_passage_yaml(start_passage: str, end_passage: str) -> Optional[str]:
+    """
+    Load the YAML code file that covers the route between two passages.
+    Files are looked up in the cached YamlAssetIndex of warehouse_navigation/data.
+
+    Args:
+        start_passage: passage ID the route starts in.
+        end_passage: passage ID the route ends in.
+
+    Returns:
+        The content of the YAML file as a string, or None if not found.
+    """
+    return get_yaml_index().read(start_passage, end_passage)
+
+
+def shortest_path(G: nx.DiGraph, start: str, end: str, return_coords: bool = False,
+                  route_table=None, weight: Optional[str] = None) -> Tuple[List, Optional[str]]:
     """
     Compute shortest path between start and end nodes.
     Also attempts to load a relevant YAML config file based on passage IDs.
@@ -82,38 +250,28 @@ def shortest_path(G: nx.DiGraph, start: str, end: str, return_coords: bool = Fal
         start: starting node ID.
         end: ending node ID.
         return_coords: if True, return list of coordinates instead of node IDs.
+        route_table: optional precomputed RouteTable (see route_table.py); when
+            given, the path is looked up instead of searched.
+        weight: edge attribute to minimize ("length" or "time", see
+            set_edge_weights) using A* with a Euclidean heuristic; None
+            minimizes hop count.
 
     Returns:
         Tuple[List, Optional[str]]: A tuple containing:
             - List of node IDs or list of coordinates along the path.
             - The content of the loaded YAML file as a string, or None if not found.
     """
-    path_nodes = nx.shortest_path(G, source=start, target=end)
+    if route_table is not None:
+        path_nodes = route_table.path(start, end)
+    elif weight is not None:
+        path_nodes = nx.astar_path(G, start, end, heuristic=euclidean_heuristic(G, weight), weight=weight)
+    else:
+        path_nodes = nx.shortest_path(G, source=start, target=end)
     start_passage = path_nodes[0].split('_W')[0][1:]
     end_passage = path_nodes[-1].split('_W')[0][1:]
 
-    print(f"Start passage: {start_passage}")
-    print(f"End passage: {end_passage}")
-
-    loaded_yaml_content = None
-    # Adjust path for glob to be relative to the submodule root
-    yaml_files = glob.glob(str(Path(__file__).parent.parent / "warehouse_navigation" / "data" / "*.yaml"))
-
-    print("yaml_files", yaml_files)
-
-    passage_version_1 = start_passage + "_" + end_passage
-    passage_version_2 = end_passage + "_" + start_passage
+    loaded_yaml_content = load_passage_yaml(start_passage, end_passage)
 
-    print("Looking for passage versions:", passage_version_1, passage_version_2)
-    
-    for yaml_file_path in yaml_files:
-        filename = Path(yaml_file_path).name
-        if passage_version_1 in filename or passage_version_2 in filename:
-            with open(yaml_file_path, 'r') as f:
-                loaded_yaml_content = f.read()
-            break
-
-    
     if return_coords:
         return [G.nodes[node]["pos"] for node in path_nodes], loaded_yaml_content
     else:
@@ -125,6 +283,11 @@ def plot_path(G: nx.DiGraph, path: List[str], title: str = ""):
     Plot graph with highlighted path, ignoring Z.
     (Requires matplotlib and networkx to be installed)
     """
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise ImportError("plot_path needs matplotlib: pip install -r requirements/plot.txt") from None
+
     # Extract only x, y for plotting
     pos = {node: (coords[0], coords[1]) for node, coords in nx.get_node_attributes(G, 'pos').items()}
 
@@ -138,13 +301,16 @@ def plot_path(G: nx.DiGraph, path: List[str], title: str = ""):
     plt.show()
 
 
-def find_closest_node(G: nx.DiGraph, target_pos: Tuple[float, float, float]) -> Dict:
+def find_closest_node(G: nx.DiGraph, target_pos: Tuple[float, float, float], spatial_index=None) -> Dict:
     """
     Find the closest node in the graph to a given position.
 
     Args:
         G: networkx DiGraph with node attribute 'pos' as (x, y, z).
         target_pos: tuple (x, y, z) representing the position to check.
+        spatial_index: optional SpatialIndex built once per graph (see
+            spatial_index.py); when given, it is queried instead of scanning
+            every node.
 
     Returns:
         Dictionary with:
@@ -152,6 +318,9 @@ def find_closest_node(G: nx.DiGraph, target_pos: Tuple[float, float, float]) ->
             - pos: coordinates of the closest node
             - distance: Euclidean distance to target_pos
     """
+    if spatial_index is not None:
+        return spatial_index.nearest(target_pos)
+
     closest_node = None
     min_dist = float('inf')
     closest_pos = None
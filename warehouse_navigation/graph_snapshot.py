@@ -0,0 +1,148 @@
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from .compact_graph import CompactGraph
+
+GRAPH_SNAPSHOT_MAGIC = b"WNGRAPH\0"
+GRAPH_SNAPSHOT_VERSION = 1
+GRAPH_SNAPSHOT_SUFFIX = ".graph.bin"
+
+# magic, format version, header length
+_PREAMBLE = struct.Struct("<8sIQ")
+# Arrays start on cache-line boundaries so every view is aligned
+_ALIGNMENT = 64
+
+# Array name -> on-disk dtype (explicitly little-endian)
+_ARRAY_DTYPES = {
+    "pos": "<f8",
+    "passage": "<i4",
+    "order": "<i4",
+    "is_intersection": "|b1",
+    "is_entrance": "|b1",
+    "indptr": "<i4",
+    "indices": "<i4",
+    "node_ids": "|u1",
+}
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def graph_snapshot_path(map_path: Union[str, Path]) -> Path:
+    """Return the snapshot file stored next to a warehouse map (warehouse_map.graph.bin)."""
+    map_path = Path(map_path)
+    return map_path.with_name(map_path.stem + GRAPH_SNAPSHOT_SUFFIX)
+
+
+def save_graph_snapshot(graph, path: Union[str, Path], source_hash: str = "") -> Path:
+    """
+    Write a graph as a versioned binary snapshot.
+
+    The file holds a small JSON header followed by the raw, aligned arrays of
+    a CompactGraph (positions, passage/order/flags, CSR adjacency and the
+    newline-joined node IDs), so load_graph_snapshot can map them without
+    parsing or copying. The file is written to a temporary name and renamed,
+    so readers never see a partial snapshot.
+
+    Args:
+        graph: networkx DiGraph from build_graph, or a CompactGraph.
+        path: destination file.
+        source_hash: optional tag identifying the source map (e.g. its content hash).
+
+    Returns:
+        The path written.
+    """
+    if not isinstance(graph, CompactGraph):
+        graph = CompactGraph.from_networkx(graph)
+
+    arrays = {
+        "pos": graph.pos,
+        "passage": graph.passage,
+        "order": graph.order,
+        "is_intersection": graph.is_intersection,
+        "is_entrance": graph.is_entrance,
+        "indptr": graph.indptr,
+        "indices": graph.indices,
+        "node_ids": np.frombuffer("\n".join(graph.node_ids).encode("utf-8"), dtype=np.uint8),
+    }
+    arrays = {name: np.ascontiguousarray(array, dtype=_ARRAY_DTYPES[name]) for name, array in arrays.items()}
+
+    # Offsets are relative to the end of the header, which is itself padded to the alignment
+    layout: Dict[str, Dict] = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+
+    header = json.dumps({"num_nodes": len(graph), "source_hash": source_hash, "arrays": layout}).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as f:
+        f.write(_PREAMBLE.pack(GRAPH_SNAPSHOT_MAGIC, GRAPH_SNAPSHOT_VERSION, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_graph_snapshot(path: Union[str, Path], source_hash: Optional[str] = None) -> Optional[CompactGraph]:
+    """
+    Load a snapshot written by save_graph_snapshot as a CompactGraph.
+
+    The file is memory-mapped read-only and the graph's arrays are views into
+    the mapping, so nothing is copied; the operating system shares the pages
+    between every process that loads the same file, and workers forked after
+    loading share the mapping itself. Call to_networkx() on the result where
+    a networkx graph is needed.
+
+    Args:
+        path: snapshot file.
+        source_hash: if given, only accept a snapshot tagged with this hash.
+
+    Returns:
+        The graph, or None if the file has another format version or a different source_hash.
+
+    Raises:
+        ValueError: If the file is not a graph snapshot.
+    """
+    path = Path(path)
+    with path.open("rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapped) < _PREAMBLE.size:
+        raise ValueError(f"Not a graph snapshot: {path}")
+    magic, version, header_size = _PREAMBLE.unpack_from(mapped)
+    if magic != GRAPH_SNAPSHOT_MAGIC:
+        raise ValueError(f"Not a graph snapshot: {path}")
+    if version != GRAPH_SNAPSHOT_VERSION:
+        return None
+
+    header = json.loads(mapped[_PREAMBLE.size:_PREAMBLE.size + header_size])
+    if source_hash is not None and header["source_hash"] != source_hash:
+        return None
+    data_start = _align(_PREAMBLE.size + header_size)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        if count == 0:
+            array = np.empty(0, dtype=dtype)
+        else:
+            array = np.frombuffer(mapped, dtype=dtype, count=count, offset=data_start + spec["offset"])
+        arrays[name] = array.reshape(spec["shape"])
+
+    node_ids = arrays.pop("node_ids").tobytes().decode("utf-8").split("\n") if header["num_nodes"] else []
+    return CompactGraph(node_ids, **arrays)
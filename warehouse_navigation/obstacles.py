@@ -0,0 +1,267 @@
+from collections import defaultdict
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+Edge = Tuple[str, str]
+
+
+def segments_hit_box(p0: np.ndarray, p1: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    Vectorized segment/axis-aligned box intersection (slab test).
+
+    Args:
+        p0, p1: (M, 3) segment start and end points.
+        lo, hi: (3,) box minimum and maximum corners.
+
+    Returns:
+        Boolean array of length M, True where the segment touches the box.
+    """
+    d = p1 - p0
+    t_enter = np.zeros(len(p0))
+    t_exit = np.ones(len(p0))
+    hit = np.ones(len(p0), dtype=bool)
+    for axis in range(3):
+        da, pa = d[:, axis], p0[:, axis]
+        parallel = da == 0
+        # Segments parallel to a slab miss unless they lie inside it
+        hit &= ~parallel | ((pa >= lo[axis]) & (pa <= hi[axis]))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t1 = (lo[axis] - pa) / da
+            t2 = (hi[axis] - pa) / da
+        t_enter = np.where(parallel, t_enter, np.maximum(t_enter, np.minimum(t1, t2)))
+        t_exit = np.where(parallel, t_exit, np.minimum(t_exit, np.maximum(t1, t2)))
+    return hit & (t_enter <= t_exit)
+
+
+class ObstacleLayer:
+    """
+    Axis-aligned box obstacles applied incrementally to a warehouse graph.
+
+    Edge segments are bucketed in a uniform 3D grid, so adding or removing
+    an obstacle only tests the edges in the cells its box overlaps, and only
+    those edges are updated. An edge covered by at least one active obstacle
+    is either removed from the graph (block mode, the default; its attributes
+    are kept and restored when it clears) or has its weights multiplied by
+    `penalty`. Routing functions then see the change directly. RouteTables
+    built before a change are not updated. Weights recomputed while an edge
+    is penalized are kept when it clears; call refresh_penalties() to
+    penalize them in the meantime.
+
+    Args:
+        G: networkx DiGraph from build_graph; modified in place.
+        cell_size: grid cell edge in meters; defaults to the mean edge length.
+        clearance: margin in meters added around every box (e.g. the drone's radius).
+        penalty: None to block edges, or a factor applied to the `weights` attributes.
+        weights: edge attributes scaled in penalty mode.
+    """
+
+    def __init__(self, G: nx.DiGraph, cell_size: Optional[float] = None, clearance: float = 0.0,
+                 penalty: Optional[float] = None, weights: Sequence[str] = ("length", "time")):
+        if penalty is not None and penalty < 1:
+            raise ValueError("penalty must be at least 1.")
+        self.G = G
+        self.clearance = clearance
+        self.penalty = penalty
+        self.weights = tuple(weights)
+
+        self.edges: List[Edge] = list(G.edges)
+        self.edge_index = {edge: i for i, edge in enumerate(self.edges)}
+        pos = nx.get_node_attributes(G, "pos")
+        self.p0 = np.array([pos[u] for u, _ in self.edges], dtype=np.float64).reshape(-1, 3)
+        self.p1 = np.array([pos[v] for _, v in self.edges], dtype=np.float64).reshape(-1, 3)
+
+        if cell_size is None:
+            lengths = np.linalg.norm(self.p1 - self.p0, axis=1)
+            cell_size = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+        self.cell_size = cell_size
+
+        # Broad phase: grid cell -> indices of the edges whose bounding box overlaps it
+        cells = defaultdict(list)
+        lo_cells = self._cell(np.minimum(self.p0, self.p1))
+        hi_cells = self._cell(np.maximum(self.p0, self.p1))
+        for i, (lo, hi) in enumerate(zip(lo_cells.tolist(), hi_cells.tolist())):
+            for cell in product(*(range(a, b + 1) for a, b in zip(lo, hi))):
+                cells[cell].append(i)
+        self.cells = {cell: np.array(ids, dtype=np.int64) for cell, ids in cells.items()}
+
+        self.obstacles: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.active: Dict[str, bool] = {}
+        self.edges_by_obstacle: Dict[str, np.ndarray] = {}
+        self.cover_count = np.zeros(len(self.edges), dtype=np.int32)
+        self._saved: Dict[Edge, dict] = {}
+
+    def _cell(self, points: np.ndarray) -> np.ndarray:
+        return np.floor(points / self.cell_size).astype(np.int64)
+
+    def edges_in_box(self, lo, hi) -> np.ndarray:
+        """Indices of the edges whose segment touches the box [lo, hi]."""
+        lo = np.asarray(lo, dtype=np.float64) - self.clearance
+        hi = np.asarray(hi, dtype=np.float64) + self.clearance
+        lo_cell, hi_cell = self._cell(lo).tolist(), self._cell(hi).tolist()
+        candidates = [self.cells[cell] for cell in product(*(range(a, b + 1) for a, b in zip(lo_cell, hi_cell)))
+                      if cell in self.cells]
+        if not candidates:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.unique(np.concatenate(candidates))
+        return candidates[segments_hit_box(self.p0[candidates], self.p1[candidates], lo, hi)]
+
+    def add_obstacle(self, name: str, position: Sequence[float], size: Sequence[float],
+                     active: bool = True) -> List[Edge]:
+        """
+        Add (or replace) a box obstacle.
+
+        Args:
+            name: obstacle name, unique within the layer.
+            position: (x, y, z) center of the box.
+            size: (width, depth, height) along x, y and z.
+            active: whether the obstacle affects routing right away.
+
+        Returns:
+            The edges whose state changed.
+        """
+        changed = self.remove_obstacle(name) if name in self.obstacles else []
+        center = np.asarray(position, dtype=np.float64)
+        half = np.abs(np.asarray(size, dtype=np.float64)) / 2
+        self.obstacles[name] = (center - half, center + half)
+        self.edges_by_obstacle[name] = self.edges_in_box(center - half, center + half)
+        self.active[name] = False
+        if active:
+            changed = _merge_edges(changed, self.set_active(name, True))
+        return changed
+
+    def remove_obstacle(self, name: str) -> List[Edge]:
+        """Remove an obstacle and return the edges whose state changed."""
+        if name not in self.obstacles:
+            raise KeyError(f"Obstacle {name} not in layer.")
+        changed = self.set_active(name, False)
+        del self.obstacles[name], self.active[name], self.edges_by_obstacle[name]
+        return changed
+
+    def set_active(self, name: str, active: bool) -> List[Edge]:
+        """
+        Switch an obstacle on or off, updating only the edges it covers.
+
+        Returns:
+            The edges that became blocked/penalized (on) or cleared (off).
+        """
+        if name not in self.obstacles:
+            raise KeyError(f"Obstacle {name} not in layer.")
+        if self.active[name] == active:
+            return []
+        self.active[name] = active
+
+        covered = self.edges_by_obstacle[name]
+        if active:
+            self.cover_count[covered] += 1
+            changed = covered[self.cover_count[covered] == 1]
+        else:
+            self.cover_count[covered] -= 1
+            changed = covered[self.cover_count[covered] == 0]
+
+        edges = [self.edges[i] for i in changed.tolist()]
+        for edge in edges:
+            if active:
+                self._apply(edge)
+            else:
+                self._restore(edge)
+        return edges
+
+    def _apply(self, edge: Edge):
+        data = self.G.edges[edge]
+        if self.penalty is None:
+            self._saved[edge] = dict(data)
+            self.G.remove_edge(*edge)
+        else:
+            # Remember the penalized values written, so clearing can tell them from weights
+            # recomputed meanwhile (e.g. by set_edge_weights), which are left as they are
+            self._saved[edge] = {weight: data[weight] * self.penalty for weight in self.weights if weight in data}
+            data.update(self._saved[edge])
+
+    def _restore(self, edge: Edge):
+        saved = self._saved.pop(edge)
+        if self.penalty is None:
+            self.G.add_edge(*edge, **saved)
+        else:
+            data = self.G.edges[edge]
+            for weight, penalized in saved.items():
+                if data.get(weight) == penalized:
+                    data[weight] = penalized / self.penalty
+
+    def refresh_penalties(self) -> List[Edge]:
+        """
+        Penalize again the weights of covered edges that were recomputed while
+        penalized (e.g. by set_edge_weights). No-op in block mode.
+
+        Returns:
+            The edges whose weights were updated.
+        """
+        changed = []
+        if self.penalty is None:
+            return changed
+        for edge, saved in self._saved.items():
+            data = self.G.edges[edge]
+            stale = [weight for weight in self.weights if weight in data and data[weight] != saved.get(weight)]
+            for weight in stale:
+                saved[weight] = data[weight] * self.penalty
+                data[weight] = saved[weight]
+            if stale:
+                changed.append(edge)
+        return changed
+
+    def affected_edges(self) -> List[Edge]:
+        """Edges currently covered by at least one active obstacle."""
+        return [self.edges[i] for i in np.flatnonzero(self.cover_count).tolist()]
+
+    def is_affected(self, u: str, v: str) -> bool:
+        i = self.edge_index.get((u, v))
+        return i is not None and self.cover_count[i] > 0
+
+
+def _merge_edges(first: List[Edge], second: List[Edge]) -> List[Edge]:
+    return list(dict.fromkeys(first + second))
+
+
+def load_obstacles_from_db(db) -> List[Dict]:
+    """
+    Read the obstacles table (the Obstacle model in models/models.py).
+
+    Args:
+        db: SQLAlchemy engine or database URL.
+
+    Returns:
+        One dict per obstacle with name, position (x, y, z) and size (width, depth, height).
+    """
+    from sqlalchemy import select
+
+    from models.models import Obstacle
+
+    from .waypoint_loader import _get_engine
+
+    stmt = select(Obstacle.name, Obstacle.position_x, Obstacle.position_y, Obstacle.position_z,
+                  Obstacle.width, Obstacle.depth, Obstacle.height).order_by(Obstacle.id)
+    with _get_engine(db).connect() as conn:
+        return [{"name": row.name,
+                 "position": (row.position_x, row.position_y, row.position_z),
+                 "size": (row.width, row.depth, row.height)}
+                for row in conn.execute(stmt)]
+
+
+def build_obstacle_layer(G: nx.DiGraph, obstacles: Iterable[Dict] = (), **options) -> ObstacleLayer:
+    """
+    Create an ObstacleLayer for a graph and add obstacles to it.
+
+    Args:
+        G: networkx DiGraph from build_graph; modified in place.
+        obstacles: dicts with name, position and size (e.g. from load_obstacles_from_db).
+        **options: cell_size, clearance, penalty and weights for ObstacleLayer.
+
+    Returns:
+        The layer, with every obstacle active.
+    """
+    layer = ObstacleLayer(G, **options)
+    for obstacle in obstacles:
+        layer.add_obstacle(obstacle["name"], obstacle["position"], obstacle["size"])
+    return layer
@@ -1,4 +1,52 @@
-from typing import List, Tuple, Dict
+import io
+import json
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+def iter_drone_path(
+    coordinates: Iterable[Tuple[float, float, float]],
+    offset: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+    wait_period: int = 2,
+) -> Iterator[Dict]:
+    """
+    Lazily convert 3D coordinates into drone schedule commands.
+
+    Yields the same commands as generate_drone_path, one at a time and
+    without printing, so coordinates can come from a generator and the
+    commands can be written out as they are produced.
+
+    Args:
+        coordinates: iterable of (x, y, z) coordinates in warehouse system.
+        offset: (x, y, z) the starting point in the warehouse
+        wait_period: default wait time after movements (seconds).
+
+    Yields:
+        dict: one drone command.
+    """
+    ox, oy, oz = offset
+    prev = None
+
+    for x, y, z in coordinates:
+        # Apply offset & Y-axis inversion
+        curr_x, curr_y, curr_z = round(x - ox, 2), round(-(y - oy), 2), round(z - oz, 2)
+
+        if prev is None:
+            # Initial takeoff to the altitude of the first waypoint, then move to it
+            yield {"type": "SCHEDULE_TAKEOFF", "arguments": {"z": curr_z}}
+            yield {"type": "SCHEDULE_WAIT_FOR_PERIOD", "arguments": {"period": wait_period}}
+            yield {"type": "SCHEDULE_FLY_TO_XY", "arguments": {"x": curr_x, "y": curr_y}}
+            yield {"type": "SCHEDULE_WAIT_FOR_PERIOD", "arguments": {"period": wait_period}}
+        else:
+            prev_x, prev_y, prev_z = prev
+            if curr_x - prev_x != 0 or curr_y - prev_y != 0:
+                yield {"type": "SCHEDULE_FLY_TO_XY", "arguments": {"x": curr_x, "y": curr_y}}
+                yield {"type": "SCHEDULE_WAIT_FOR_PERIOD", "arguments": {"period": wait_period}}
+            if curr_z != prev_z:
+                yield {"type": "SCHEDULE_FLY_TO_Z", "arguments": {"z": curr_z}}
+                yield {"type": "SCHEDULE_WAIT_FOR_PERIOD", "arguments": {"period": wait_period}}
+
+        prev = (curr_x, curr_y, curr_z)
+
 
 def generate_drone_path(
     coordinates: List[Tuple[float, float, float]],
@@ -10,6 +58,9 @@ def generate_drone_path(
     Only add Z commands when altitude changes.
     Starts from the origin (0,0,0) as the first waypoint.
 
+    Prints the adjusted coordinates; use iter_drone_path to stream the
+    commands without printing.
+
     Args:
         coordinates: List of (x, y, z) coordinates in warehouse system.
         offset: (x, y, z) the starting point in the warehouse
@@ -18,70 +69,54 @@ def generate_drone_path(
     Returns:
         List of dicts with drone commands.
     """
-    flight_path = []
-
     if not coordinates:
-        return flight_path
-
-    # Apply offset & Y-axis inversion
-    adjusted_coords = [
-        (round(x - offset[0], 2), round(-(y - offset[1]), 2), round(z - offset[2], 2)) for x, y, z in coordinates
-    ]
-
-    print(adjusted_coords)
-
-    # Start from origin
-    prev_x, prev_y, prev_z = 0.0, 0.0, 0.0
-
-    # Initial takeoff to the altitude of the first waypoint
-    first_x, first_y, first_z = adjusted_coords[0]
-    flight_path.append({
-        "type": "SCHEDULE_TAKEOFF",
-        "arguments": {"z": first_z}
-    })
-    flight_path.append({
-        "type": "SCHEDULE_WAIT_FOR_PERIOD",
-        "arguments": {"period": wait_period}
-    })
-    prev_z = first_z  # Update previous Z after takeoff
-    prev_x, prev_y = first_x, first_y  # Move to the first waypoint
-    flight_path.append({
-        "type": "SCHEDULE_FLY_TO_XY",
-        "arguments": {"x": first_x, "y": first_y}
-    })
-    flight_path.append({
-        "type": "SCHEDULE_WAIT_FOR_PERIOD",
-        "arguments": {"period": wait_period}
-    })
-
-    # Process remaining waypoints
-    for curr_x, curr_y, curr_z in adjusted_coords[1:]:
-        dx = curr_x - prev_x
-        dy = curr_y - prev_y
-
-        # XY movement (relative)
-        if dx != 0 or dy != 0:
-            flight_path.append({
-                "type": "SCHEDULE_FLY_TO_XY",
-                "arguments": {"x": curr_x, "y": curr_y}
-            })
-            flight_path.append({
-                "type": "SCHEDULE_WAIT_FOR_PERIOD",
-                "arguments": {"period": wait_period}
-            })
-
-        if curr_z != prev_z:
-            flight_path.append({
-                "type": "SCHEDULE_FLY_TO_Z",
-                "arguments": {"z": curr_z}
-            })
-            flight_path.append({
-                "type": "SCHEDULE_WAIT_FOR_PERIOD",
-                "arguments": {"period": wait_period}
-            })
-
-        prev_x, prev_y, prev_z = curr_x, curr_y, curr_z
-
-    return flight_path
+        return []
+
+    print([(round(x - offset[0], 2), round(-(y - offset[1]), 2), round(z - offset[2], 2))
+           for x, y, z in coordinates])
+
+    return list(iter_drone_path(coordinates, offset, wait_period))
+
+
+def write_drone_path(commands: Iterable[Dict], output: Union[str, Path, TextIO, BinaryIO],
+                     binary: Optional[bool] = None) -> int:
+    """
+    Write drone commands as they are produced, as JSON or as a packed binary schedule.
+
+    The JSON form is a compact array with one command per line. The binary
+    form (preflight_dynamic_path.flight_time.schedule_format) stores each
+    command as a fixed-size record of an opcode and float32 arguments;
+    load_path, iter_path and extract_commands read both.
+
+    Args:
+        commands: drone commands, e.g. from iter_drone_path.
+        output: destination path, or a text (JSON) / binary file object.
+        binary: write the binary format; by default chosen from the ".bin" suffix of a
+            path, or from whether a file object is a binary stream (including BytesIO).
+
+    Returns:
+        Number of commands written.
+    """
+    if binary is None:
+        if isinstance(output, (str, Path)):
+            binary = Path(output).suffix == ".bin"
+        else:
+            binary = isinstance(output, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(output, "mode", "")
+
+    if binary:
+        from preflight_dynamic_path.flight_time.schedule_format import write_binary_schedule
+
+        return write_binary_schedule(commands, output)
 
+    if isinstance(output, (str, Path)):
+        with open(output, "w", encoding="utf-8") as f:
+            return write_drone_path(commands, f, binary=False)
 
+    count = 0
+    output.write("[")
+    for cmd in commands:
+        output.write(",\n" if count else "\n")
+        output.write(json.dumps(cmd))
+        count += 1
+    output.write("\n]\n")
+    return count
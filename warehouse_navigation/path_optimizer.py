@@ -0,0 +1,201 @@
+from math import hypot
+from typing import Dict, List, Optional, Tuple
+
+from .graph_builder import traversal_time
+
+# Raw schedule command types and the names run_estimation charges their delays under
+COMMAND_DELAY_NAMES = {
+    "SCHEDULE_TAKEOFF": "TAKEOFF",
+    "SCHEDULE_SET_XY_SPEED": "SET_SPEED",
+    "SCHEDULE_WAIT_FOR_PERIOD": "WAIT",
+    "SCHEDULE_FLY_TO_XY": "MOVE_XY",
+    "SCHEDULE_FLY_TO_Z": "MOVE_Z",
+}
+MOVE_TYPES = ("SCHEDULE_TAKEOFF", "SCHEDULE_FLY_TO_XY", "SCHEDULE_FLY_TO_Z")
+OBJECTIVES = ("time", "commands")
+
+
+class _CostModel:
+    """run_estimation's cost model for single commands of a raw schedule."""
+
+    def __init__(self, config: Optional[Dict], speed: float):
+        if speed <= 0:
+            raise ValueError("Flight speed must be greater than 0")
+        # Imported here: the flight_time package pulls in PyYAML
+        from preflight_dynamic_path.flight_time.calculations import calibration_factors
+
+        config = config or {}
+        self.speed = speed
+        self.factors = calibration_factors(config, speed)
+        self.delays = config.get("command_delays_seconds", {})
+
+    def delay(self, cmd_type: str) -> float:
+        return self.delays.get(COMMAND_DELAY_NAMES.get(cmd_type), 0.0)
+
+    def move(self, cmd_type: str, start, end) -> float:
+        horizontal = hypot(end[0] - start[0], end[1] - start[1])
+        return traversal_time(horizontal, end[2] - start[2], self.speed, self.factors) + self.delay(cmd_type)
+
+    def wait(self, period: float) -> float:
+        return period * self.factors.get("wait", 1.0) + self.delay("SCHEDULE_WAIT_FOR_PERIOD")
+
+
+def _target(cmd: Dict, position: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """Position after a command, following path_parser.iter_commands."""
+    cmd_type, args = cmd.get("type"), cmd.get("arguments", {})
+    x, y, z = position
+    if cmd_type == "SCHEDULE_TAKEOFF":
+        return float(args.get("x", 0.0)), float(args.get("y", 0.0)), float(args.get("z", 0.0))
+    if cmd_type == "SCHEDULE_FLY_TO_XY":
+        return float(args.get("x", x)), float(args.get("y", y)), z
+    if cmd_type == "SCHEDULE_FLY_TO_Z":
+        return x, y, float(args.get("z", z))
+    return position
+
+
+def schedule_seconds(commands: List[Dict], config: Optional[Dict] = None, speed: float = 1.0) -> float:
+    """
+    Estimated duration of a raw schedule in seconds, using run_estimation's
+    cost model (calibrated distance and wait times plus command delays,
+    without the landing phase).
+
+    Args:
+        commands: schedule commands as produced by generate_drone_path.
+        config: flight-time config providing calibration.speeds and command_delays_seconds.
+        speed: flight speed in m/s.
+    """
+    cost = _CostModel(config, speed)
+    position = (0.0, 0.0, 0.0)
+    seconds = 0.0
+    for cmd in commands:
+        cmd_type = cmd.get("type")
+        if cmd_type in MOVE_TYPES:
+            end = _target(cmd, position)
+            seconds += cost.move(cmd_type, position, end)
+            position = end
+        elif cmd_type == "SCHEDULE_WAIT_FOR_PERIOD":
+            seconds += cost.wait(float(cmd.get("arguments", {}).get("period", 0.0)))
+        else:
+            seconds += cost.delay(cmd_type)
+    return seconds
+
+
+def _on_segment(start, mid, end, tolerance: float, axes: Tuple[int, ...]) -> bool:
+    """True if `mid` lies within `tolerance` of the segment start->end on the given axes."""
+    s = [start[a] for a in axes]
+    m = [mid[a] for a in axes]
+    e = [end[a] for a in axes]
+    d = [b - a for a, b in zip(s, e)]
+    length_sq = sum(c * c for c in d)
+    t = 0.0 if length_sq == 0 else sum((b - a) * c for a, b, c in zip(s, m, d)) / length_sq
+    t = min(1.0, max(0.0, t))
+    return sum((b - (a + t * c)) ** 2 for a, b, c in zip(s, m, d)) <= (tolerance + 1e-9) ** 2
+
+
+def _with_target(cmd: Dict, end) -> Dict:
+    args = dict(cmd.get("arguments", {}))
+    if cmd["type"] == "SCHEDULE_FLY_TO_XY":
+        args.update(x=end[0], y=end[1])
+    else:
+        args.update(z=end[2])
+    return {**cmd, "arguments": args}
+
+
+def compact_drone_path(commands: List[Dict], config: Optional[Dict] = None, speed: float = 1.0,
+                       max_deviation: float = 0.0, objective: str = "time") -> Tuple[List[Dict], Dict]:
+    """
+    Shorten a schedule produced by generate_drone_path.
+
+    The pass
+      - merges consecutive SCHEDULE_FLY_TO_XY moves while every dropped
+        intermediate point lies on the merged straight line (within
+        max_deviation meters), as along a passage, and likewise consecutive
+        SCHEDULE_FLY_TO_Z moves;
+      - drops the waits of merged moves and moves that go nowhere;
+      - collapses back-to-back waits into one wait of the longest period.
+
+    With objective="time" a rewrite is only applied when run_estimation's
+    cost model (see schedule_seconds) says it shortens the flight; with
+    objective="commands" every rewrite that removes commands is applied.
+
+    Args:
+        commands: schedule commands as produced by generate_drone_path.
+        config: flight-time config used by the cost model.
+        speed: flight speed in m/s used by the cost model.
+        max_deviation: how far (m) a dropped intermediate point may lie from the merged segment.
+        objective: "time" or "commands".
+
+    Returns:
+        (compacted commands, report) where report holds commands_before,
+        commands_after, commands_saved, seconds_before, seconds_after and seconds_saved.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+    cost = _CostModel(config, speed)
+    force = objective == "commands"
+
+    # Each entry is a non-wait command with the waits that follow it
+    entries: List[Dict] = []
+    position = (0.0, 0.0, 0.0)
+
+    for cmd in commands:
+        cmd_type = cmd.get("type")
+        if cmd_type == "SCHEDULE_WAIT_FOR_PERIOD":
+            if not entries:
+                entries.append({"cmd": None, "start": position, "end": position, "via": [], "waits": []})
+            entries[-1]["waits"].append(cmd)
+            continue
+
+        end = _target(cmd, position)
+        # via: intermediate points already merged into this move
+        entry = {"cmd": cmd, "start": position, "end": end, "via": [], "waits": []}
+        start, position = position, end
+
+        if cmd_type not in ("SCHEDULE_FLY_TO_XY", "SCHEDULE_FLY_TO_Z"):
+            entries.append(entry)
+            continue
+
+        # A move that goes nowhere only costs its delay; its waits join the previous command's
+        if end == start and entries and (force or cost.move(cmd_type, start, end) > 0):
+            continue
+
+        prev = entries[-1] if entries else None
+        axes = (0, 1) if cmd_type == "SCHEDULE_FLY_TO_XY" else (2,)
+        if (prev is not None and prev["cmd"] is not None and prev["cmd"].get("type") == cmd_type
+                and all(_on_segment(prev["start"], point, end, max_deviation, axes)
+                        for point in prev["via"] + [prev["end"]])):
+            separate = (cost.move(cmd_type, prev["start"], prev["end"]) + cost.move(cmd_type, start, end)
+                        + sum(cost.wait(float(w.get("arguments", {}).get("period", 0.0))) for w in prev["waits"]))
+            if force or cost.move(cmd_type, prev["start"], end) < separate:
+                prev["cmd"] = _with_target(prev["cmd"], end)
+                prev["via"].append(prev["end"])
+                prev["end"] = end
+                prev["waits"] = []
+                continue
+
+        entries.append(entry)
+
+    compacted = []
+    for entry in entries:
+        if entry["cmd"] is not None:
+            compacted.append(entry["cmd"])
+        waits = entry["waits"]
+        if len(waits) > 1:
+            longest = max(waits, key=lambda w: float(w.get("arguments", {}).get("period", 0.0)))
+            periods = [float(w.get("arguments", {}).get("period", 0.0)) for w in waits]
+            kept = sum(cost.wait(p) for p in periods)
+            if force or cost.wait(max(periods)) < kept:
+                waits = [longest]
+        compacted.extend(waits)
+
+    seconds_before = schedule_seconds(commands, config, speed)
+    seconds_after = schedule_seconds(compacted, config, speed)
+    report = {
+        "commands_before": len(commands),
+        "commands_after": len(compacted),
+        "commands_saved": len(commands) - len(compacted),
+        "seconds_before": seconds_before,
+        "seconds_after": seconds_after,
+        "seconds_saved": seconds_before - seconds_after,
+    }
+    return compacted, report
@@ -0,0 +1,138 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+
+from .path_builder import iter_drone_path
+from .path_optimizer import compact_drone_path
+from .yaml_index import get_yaml_index
+
+# Minimum number of distinct start nodes before searches are spread over a process pool
+PARALLEL_THRESHOLD = 128
+
+_worker_graph: Optional[nx.DiGraph] = None
+_worker_weight: Optional[str] = None
+
+
+def _init_worker(G: nx.DiGraph, weight: Optional[str]):
+    global _worker_graph, _worker_weight
+    _worker_graph = G
+    _worker_weight = weight
+
+
+def _search_from(G: nx.DiGraph, start: str, ends: Iterable[str], weight: Optional[str]) -> Dict[str, List[str]]:
+    """Single-source search from start, keeping only the paths to the requested ends."""
+    if weight is None:
+        paths = nx.single_source_shortest_path(G, start)
+    else:
+        paths = nx.single_source_dijkstra_path(G, start, weight=weight)
+    return {end: paths[end] for end in ends if end in paths}
+
+
+def _search_chunk(jobs: List[Tuple[str, List[str]]]) -> Dict[str, Dict[str, List[str]]]:
+    return {start: _search_from(_worker_graph, start, ends, _worker_weight) for start, ends in jobs}
+
+
+def _chunks(items: Sequence, count: int) -> List[Sequence]:
+    size = max(1, -(-len(items) // count))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _find_paths(G: nx.DiGraph, ends_by_start: Dict[str, List[str]], route_table,
+                processes: Optional[int], parallel_threshold: int,
+                weight: Optional[str] = None) -> Dict[str, Dict[str, List[str]]]:
+    if route_table is not None:
+        return {start: {end: route_table.path(start, end) for end in ends}
+                for start, ends in ends_by_start.items()}
+
+    jobs = list(ends_by_start.items())
+    workers = processes if processes is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) < parallel_threshold:
+        return {start: _search_from(G, start, ends, weight) for start, ends in jobs}
+
+    paths = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(G, weight)) as pool:
+        for result in pool.map(_search_chunk, _chunks(jobs, workers * 4)):
+            paths.update(result)
+    return paths
+
+
+def plan_routes(G: nx.DiGraph, pairs: Sequence[Tuple[str, str]],
+                offset: Tuple[float, float, float] = (0.0, 0.0, 0.0), wait_period: int = 2,
+                route_table=None, processes: Optional[int] = None,
+                parallel_threshold: int = PARALLEL_THRESHOLD, weight: Optional[str] = None,
+                compact: bool = False, config: Optional[Dict] = None) -> List[Dict]:
+    """
+    Plan many missions over one graph in a single call.
+
+    Pairs are grouped by start node and a single-source search is run once
+    per distinct start (or the paths are looked up in a RouteTable). When the
+    number of distinct starts reaches parallel_threshold, the searches run on
+    a process pool.
+
+    Args:
+        G: networkx DiGraph from build_graph.
+        pairs: (start_node, end_node) pairs.
+        offset: (x, y, z) the starting point in the warehouse, passed to iter_drone_path.
+        wait_period: wait time after movements (seconds), passed to iter_drone_path.
+        route_table: optional RouteTable to look paths up instead of searching.
+        processes: worker processes for the search; defaults to the CPU count, 1 disables the pool.
+        parallel_threshold: minimum number of distinct start nodes before the pool is used.
+        weight: edge attribute to minimize ("length" or "time"); None minimizes hop count.
+        compact: shorten each schedule with compact_drone_path (objective="time").
+        config: flight-time config for the compaction cost model.
+
+    Returns:
+        One dictionary per pair, in input order, with:
+            - start, end: the node IDs
+            - path: list of node IDs
+            - commands: drone commands from iter_drone_path (repeated
+              pairs share the same list)
+            - yaml_file: path of the passage YAML code file, or None if not found
+            - compaction: the compact_drone_path report (only when compact is set)
+    """
+    for start, end in pairs:
+        for node in (start, end):
+            if node not in G:
+                raise nx.NodeNotFound(f"Node {node} not in graph.")
+
+    ends_by_start = defaultdict(dict)
+    for start, end in pairs:
+        ends_by_start[start][end] = None
+
+    paths = _find_paths(G, {start: list(ends) for start, ends in ends_by_start.items()},
+                        route_table, processes, parallel_threshold, weight)
+
+    yaml_index = get_yaml_index()
+    commands_cache = {}
+    yaml_files = {}
+    results = []
+    for start, end in pairs:
+        path = paths[start].get(end)
+        if path is None:
+            raise nx.NetworkXNoPath(f"No path between {start} and {end}.")
+
+        if (start, end) not in commands_cache:
+            coordinates = [G.nodes[node]["pos"] for node in path]
+            commands = list(iter_drone_path(coordinates, offset, wait_period))
+            commands_cache[(start, end)] = compact_drone_path(commands, config) if compact else (commands, None)
+
+        passages = (G.nodes[path[0]]["passage_id"], G.nodes[path[-1]]["passage_id"])
+        if passages not in yaml_files:
+            yaml_files[passages] = yaml_index.find(*passages)
+
+        commands, report = commands_cache[(start, end)]
+        result = {
+            "start": start,
+            "end": end,
+            "path": path,
+            "commands": commands,
+            "yaml_file": yaml_files[passages],
+        }
+        if compact:
+            result["compaction"] = report
+        results.append(result)
+
+    return results
@@ -0,0 +1,184 @@
+import hashlib
+from pathlib import Path
+from typing import List, Optional, Union
+
+import networkx as nx
+import numpy as np
+
+from .graph_builder import load_warehouse_map, build_graph
+
+ROUTE_TABLE_SUFFIX = ".routes.npz"
+NO_ROUTE = -1
+
+
+def map_content_hash(map_path: Union[str, Path]) -> str:
+    """Return the SHA-256 hex digest of a warehouse map file."""
+    return hashlib.sha256(Path(map_path).read_bytes()).hexdigest()
+
+
+def graph_digest(G: nx.DiGraph, weight: Optional[str] = None) -> str:
+    """
+    Return a SHA-256 hex digest of a graph's edge set and, if given, the values
+    of the `weight` edge attribute, so that route tables built over re-weighted
+    or edited graphs are told apart.
+    """
+    lines = sorted(f"{u}\t{v}\t{data.get(weight)!r}" if weight is not None else f"{u}\t{v}"
+                   for u, v, data in G.edges(data=True))
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def route_table_path(map_path: Union[str, Path]) -> Path:
+    """Return the route table file stored next to a warehouse map (warehouse_map.routes.npz)."""
+    map_path = Path(map_path)
+    return map_path.with_name(map_path.stem + ROUTE_TABLE_SUFFIX)
+
+
+def _index_dtype(num_nodes: int):
+    """Smallest signed integer type able to hold every node index plus NO_ROUTE."""
+    if num_nodes < np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
+
+
+class RouteTable:
+    """
+    All-pairs next-hop matrix for a warehouse graph.
+
+    next_hop[i, j] holds the index of the node that follows node i on the
+    shortest path from i to j (NO_ROUTE if j is unreachable), so a path is
+    recovered in O(path length) without running a graph search.
+    """
+
+    def __init__(self, nodes: List[str], next_hop: np.ndarray, map_hash: Optional[str] = None,
+                 weight: Optional[str] = None, graph_hash: Optional[str] = None):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.next_hop = next_hop
+        self.map_hash = map_hash
+        self.weight = weight
+        self.graph_hash = graph_hash
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def index_path(self, start: int, end: int) -> List[int]:
+        """Return the shortest path between two node indices as a list of indices."""
+        if start == end:
+            return [start]
+        if self.next_hop[start, end] == NO_ROUTE:
+            raise nx.NetworkXNoPath(f"No path between {self.nodes[start]} and {self.nodes[end]}.")
+
+        path = [start]
+        current = start
+        while current != end:
+            current = int(self.next_hop[current, end])
+            path.append(current)
+        return path
+
+    def path(self, start: str, end: str) -> List[str]:
+        """Return the shortest path between two node IDs as a list of node IDs."""
+        for node in (start, end):
+            if node not in self.index:
+                raise nx.NodeNotFound(f"Node {node} not in route table.")
+        return [self.nodes[i] for i in self.index_path(self.index[start], self.index[end])]
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Save the route table as a compressed .npz file."""
+        path = Path(path)
+        with path.open("wb") as f:
+            np.savez_compressed(
+                f,
+                nodes=np.array(self.nodes, dtype=str),
+                next_hop=self.next_hop,
+                map_hash=np.array(self.map_hash or ""),
+                weight=np.array(self.weight or ""),
+                graph_hash=np.array(self.graph_hash or ""),
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "RouteTable":
+        """Load a route table previously written by save()."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            return cls(
+                nodes=data["nodes"].tolist(),
+                next_hop=data["next_hop"],
+                map_hash=str(data["map_hash"]) or None,
+                weight=str(data["weight"]) or None,
+                graph_hash=(str(data["graph_hash"]) or None) if "graph_hash" in data else None,
+            )
+
+
+def build_route_table(G: nx.DiGraph, weight: Optional[str] = None, map_hash: Optional[str] = None,
+                      graph_hash: Optional[str] = None) -> RouteTable:
+    """
+    Precompute the next hop between every pair of nodes in the graph.
+
+    Args:
+        G: networkx DiGraph built by build_graph.
+        weight: edge attribute to minimize; None minimizes hop count.
+        map_hash: content hash of the warehouse map the graph was built from.
+        graph_hash: graph_digest of G, recorded for cache validation.
+
+    Returns:
+        RouteTable for the graph.
+    """
+    nodes = list(G.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    next_hop = np.full((len(nodes), len(nodes)), NO_ROUTE, dtype=_index_dtype(len(nodes)))
+
+    for source in nodes:
+        if weight is None:
+            paths = nx.single_source_shortest_path(G, source)
+        else:
+            paths = nx.single_source_dijkstra_path(G, source, weight=weight)
+
+        i = index[source]
+        next_hop[i, i] = i
+        for target, path in paths.items():
+            if len(path) > 1:
+                next_hop[i, index[target]] = index[path[1]]
+
+    return RouteTable(nodes, next_hop, map_hash=map_hash, weight=weight, graph_hash=graph_hash)
+
+
+def load_route_table(map_path: Union[str, Path], G: Optional[nx.DiGraph] = None,
+                     weight: Optional[str] = None) -> RouteTable:
+    """
+    Load the route table stored next to a warehouse map, rebuilding it if needed.
+
+    The cached table is reused only while the map file's content hash, the
+    edge weight and the graph's edges and weight values (see graph_digest)
+    match the ones it was built from; otherwise it is rebuilt and written
+    back to disk. Without G, the table stands for the graph build_graph makes
+    from the map as-is.
+
+    Args:
+        map_path: path to warehouse_map.json.
+        G: graph built from the map, possibly re-weighted (e.g. by
+            set_edge_weights); built with build_graph if omitted.
+        weight: edge attribute to minimize; None minimizes hop count.
+
+    Returns:
+        RouteTable for the map.
+    """
+    map_path = Path(map_path)
+    map_hash = map_content_hash(map_path)
+    table_path = route_table_path(map_path)
+    graph_hash = graph_digest(G, weight) if G is not None else None
+
+    if table_path.exists():
+        try:
+            table = RouteTable.load(table_path)
+        except (OSError, KeyError, ValueError):
+            table = None
+        if (table is not None and table.map_hash == map_hash and table.weight == weight
+                and table.graph_hash == graph_hash):
+            return table
+
+    if G is None:
+        G, _ = build_graph(load_warehouse_map(map_path))
+
+    table = build_route_table(G, weight=weight, map_hash=map_hash, graph_hash=graph_hash)
+    table.save(table_path)
+    return table
@@ -0,0 +1,231 @@
+from collections import deque
+from typing import Dict, List, Sequence, Tuple, Union
+
+import networkx as nx
+
+from .graph_builder import find_closest_node
+
+
+def battery_budget_seconds(config: Dict, reserve: float = 0.0) -> float:
+    """
+    Flight seconds available per sortie: battery_time_minutes minus the
+    landing phase, keeping `reserve` (a fraction of the battery) unused.
+    """
+    battery_time_min = config.get("battery_time_minutes")
+    if battery_time_min is None or battery_time_min <= 0:
+        raise ValueError("Config must include positive 'battery_time_minutes'")
+    if not 0 <= reserve < 1:
+        raise ValueError("reserve must be in [0, 1)")
+    return battery_time_min * 60 * (1 - reserve) - config.get("landing_phase_duration_minutes", 0) * 60
+
+
+def station_node(G: nx.DiGraph, station, spatial_index=None) -> str:
+    """
+    Graph node a drone station is attached to.
+
+    Args:
+        G: networkx DiGraph from build_graph.
+        station: a node ID, a DroneStation row (position_x/y/z), a dict
+            with "position" (as from load_drone_stations), or an (x, y, z) tuple.
+        spatial_index: optional SpatialIndex for the closest-node query.
+    """
+    if isinstance(station, str):
+        if station not in G:
+            raise nx.NodeNotFound(f"Node {station} not in graph.")
+        return station
+    if isinstance(station, dict):
+        position = station["position"]
+    elif hasattr(station, "position_x"):
+        position = (station.position_x, station.position_y, station.position_z)
+    else:
+        position = tuple(station)
+    return find_closest_node(G, position, spatial_index)["node_id"]
+
+
+def load_drone_stations(db) -> List[Dict]:
+    """
+    Read the drone_stations table (the DroneStation model in models/models.py).
+
+    Args:
+        db: SQLAlchemy engine or database URL.
+
+    Returns:
+        One dict per station with name and position (x, y, z).
+    """
+    from sqlalchemy import select
+
+    from models.models import DroneStation
+
+    from .waypoint_loader import _get_engine
+
+    stmt = select(DroneStation.station_name, DroneStation.position_x, DroneStation.position_y,
+                  DroneStation.position_z).order_by(DroneStation.id)
+    with _get_engine(db).connect() as conn:
+        return [{"name": row.station_name, "position": (row.position_x, row.position_y, row.position_z)}
+                for row in conn.execute(stmt)]
+
+
+def stops_from_commands(G: nx.DiGraph, commands: Sequence[Dict],
+                        offset: Tuple[float, float, float] = (0.0, 0.0, 0.0), spatial_index=None) -> List[str]:
+    """
+    Graph nodes visited by a drone schedule, in order.
+
+    Positions after every TAKEOFF/FLY_TO command are mapped back to
+    warehouse coordinates (undoing generate_drone_path's offset and Y
+    inversion) and then to the closest node; repeated nodes are dropped.
+
+    Args:
+        G: networkx DiGraph from build_graph.
+        commands: schedule commands, e.g. from generate_drone_path or load_path.
+        offset: the offset the schedule was generated with.
+        spatial_index: optional SpatialIndex for the closest-node queries.
+    """
+    ox, oy, oz = offset
+    x = y = z = 0.0
+    stops = []
+    for cmd in commands:
+        cmd_type, args = cmd.get("type"), cmd.get("arguments", {})
+        if cmd_type == "SCHEDULE_TAKEOFF":
+            x, y, z = args.get("x", 0.0), args.get("y", 0.0), args.get("z", 0.0)
+        elif cmd_type == "SCHEDULE_FLY_TO_XY":
+            x, y = args.get("x", x), args.get("y", y)
+        elif cmd_type == "SCHEDULE_FLY_TO_Z":
+            z = args.get("z", z)
+        else:
+            continue
+        node = find_closest_node(G, (x + ox, oy - y, z + oz), spatial_index)["node_id"]
+        if not stops or stops[-1] != node:
+            stops.append(node)
+    return stops
+
+
+class _LegCosts:
+    """Shortest-path costs from each source node (one search per source) and leg paths, cached."""
+
+    def __init__(self, G: nx.DiGraph, weight: str):
+        self.G = G
+        self.weight = weight
+        self._lengths = {}
+        self._paths = {}
+
+    def cost(self, source: str, target: str) -> float:
+        if source not in self._lengths:
+            self._lengths[source] = nx.single_source_dijkstra_path_length(self.G, source, weight=self.weight)
+        lengths = self._lengths[source]
+        if target not in lengths:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        return lengths[target]
+
+    def path(self, source: str, target: str) -> List[str]:
+        if (source, target) not in self._paths:
+            self._paths[(source, target)] = nx.dijkstra_path(self.G, source, target, weight=self.weight)
+        return self._paths[(source, target)]
+
+    def to_target(self, target: str) -> Dict[str, float]:
+        """Cost from every node that can reach target (one search on the reversed graph)."""
+        return nx.single_source_dijkstra_path_length(self.G.reverse(copy=False), target, weight=self.weight)
+
+
+def plan_sorties(G: nx.DiGraph, stops: Sequence[str], station, battery_seconds: float,
+                 stop_seconds: Union[float, Sequence[float]] = 0.0, turnaround_seconds: float = 0.0,
+                 weight: str = "time", spatial_index=None, paths: bool = True) -> List[Dict]:
+    """
+    Split a visit list into battery-feasible sorties from and back to a drone station.
+
+    Stops are visited in the given order. Each sortie flies from the station
+    to its first stop, through its stops, and back, along shortest paths by
+    `weight`, and must fit in battery_seconds. Among all such splits, the one
+    with the least total time (flight plus turnaround_seconds per sortie for
+    recharging) is found exactly by dynamic programming. Because leg costs are
+    shortest-path costs, a sortie that fits still fits with stops removed from
+    either end, so the candidate first stops of a sortie ending at stop j form
+    a window that only moves forward with j. A monotone queue keeps the best
+    split inside that window, making the whole search O(number of stops) after
+    one shortest-path search per distinct stop.
+
+    Call set_edge_weights first so that "time" includes the calibration,
+    command delays and waits of the flight-time config.
+
+    Args:
+        G: networkx DiGraph from build_graph.
+        stops: node IDs to visit, in order (e.g. from stops_from_commands).
+        station: the drone station (see station_node).
+        battery_seconds: flight seconds available per sortie (see battery_budget_seconds).
+        stop_seconds: time spent at each stop, one value for all stops or one per stop.
+        turnaround_seconds: time at the station between two sorties.
+        weight: edge attribute holding the leg cost in seconds.
+        spatial_index: optional SpatialIndex used to place the station.
+        paths: include the full node path of every sortie.
+
+    Returns:
+        One dictionary per sortie with:
+            - stops: the node IDs visited
+            - first, last: indices of its first and last stop in `stops`
+            - seconds: flight time, station to station
+            - path: node path from the station back to it (when paths is set)
+    """
+    n = len(stops)
+    if n == 0:
+        return []
+    for node in stops:
+        if node not in G:
+            raise nx.NodeNotFound(f"Node {node} not in graph.")
+    home = station_node(G, station, spatial_index)
+    service = [float(stop_seconds)] * n if isinstance(stop_seconds, (int, float)) else [float(s) for s in stop_seconds]
+    if len(service) != n:
+        raise ValueError("stop_seconds must have one value per stop.")
+
+    legs = _LegCosts(G, weight)
+    back_lengths = legs.to_target(home)
+    out = [legs.cost(home, node) for node in stops]
+    back = []
+    for node in stops:
+        if node not in back_lengths:
+            raise nx.NetworkXNoPath(f"No path between {node} and {home}.")
+        back.append(back_lengths[node])
+
+    # prefix[k]: cost of flying stops 0..k-1 in order, including their service time
+    prefix = [0.0] * (n + 1)
+    for k in range(n):
+        leg = legs.cost(stops[k - 1], stops[k]) if k else 0.0
+        prefix[k + 1] = prefix[k] + leg + service[k]
+
+    def sortie_seconds(i: int, j: int) -> float:
+        # Station -> stop i -> ... -> stop j -> station; the leg into stop i is replaced by the outbound leg
+        return out[i] - (prefix[i + 1] - service[i]) + prefix[j + 1] + back[j]
+
+    # best[j + 1]: least total time covering stops 0..j; a sortie starting at stop i
+    # costs key[i] + prefix[j + 1] + back[j], where key[i] only depends on i
+    best = [0.0] * (n + 1)
+    first = [0] * n
+    window = deque()  # (first stop, key) candidates with increasing keys
+    lo = 0
+    for j in range(n):
+        key = best[j] + (turnaround_seconds if j else 0.0) + out[j] - (prefix[j + 1] - service[j])
+        while window and window[-1][1] >= key:
+            window.pop()
+        window.append((j, key))
+        while lo <= j and sortie_seconds(lo, j) > battery_seconds:
+            lo += 1
+        if lo > j:
+            raise ValueError(f"Stop {j} ({stops[j]}) cannot be reached and left within one battery "
+                             f"({sortie_seconds(j, j):.1f}s > {battery_seconds:.1f}s).")
+        while window[0][0] < lo:
+            window.popleft()
+        first[j], key = window[0]
+        best[j + 1] = key + prefix[j + 1] + back[j]
+
+    sorties = []
+    j = n - 1
+    while j >= 0:
+        i = first[j]
+        sortie = {"stops": list(stops[i:j + 1]), "first": i, "last": j, "seconds": sortie_seconds(i, j)}
+        if paths:
+            route = list(legs.path(home, stops[i]))
+            for a, b in zip(stops[i:j], stops[i + 1:j + 1]):
+                route += legs.path(a, b)[1:]
+            sortie["path"] = route + legs.path(stops[j], home)[1:]
+        sorties.append(sortie)
+        j = i - 1
+    sorties.reverse()
+    return sorties
@@ -0,0 +1,245 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Approximate number of nodes per grid cell when the cell size is chosen automatically
+_NODES_PER_CELL = 2.0
+
+
+class SpatialIndex:
+    """
+    Uniform-grid spatial index over graph node positions.
+
+    Nodes are bucketed into cubic cells; nearest-node queries search rings of
+    cells around the query point until no closer node can exist. All batch
+    queries are vectorized over the query points.
+
+    Args:
+        node_ids: string ID of each indexed node.
+        positions: array-like of shape (N, 3) with node positions.
+        cell_size: edge length of a grid cell; chosen from the node density if omitted.
+    """
+
+    def __init__(self, node_ids: Sequence[str], positions, cell_size: Optional[float] = None):
+        self.node_ids = np.array(list(node_ids), dtype=str)
+        self.pos = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        if len(self.node_ids) != len(self.pos):
+            raise ValueError("node_ids and positions must have the same length.")
+        if len(self.pos) == 0:
+            raise ValueError("Cannot build a spatial index without nodes.")
+
+        self.origin = self.pos.min(axis=0)
+        extent = self.pos.max(axis=0) - self.origin
+        self.cell_size = float(cell_size) if cell_size else _auto_cell_size(extent, len(self.pos))
+        self.shape = (np.floor(extent / self.cell_size).astype(np.int64) + 1)
+
+        # Bucket nodes by cell: cell_nodes[slot] lists the nodes of one occupied
+        # cell, padded with -1; grid maps a cell coordinate to its slot (or -1).
+        cells = self._cell_of(self.pos)
+        keys = np.ravel_multi_index(cells.T, self.shape)
+        order = np.argsort(keys, kind="stable")
+        unique_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+        self.cell_nodes = np.full((len(unique_keys), counts.max()), -1, dtype=np.int64)
+        column = np.arange(len(order)) - np.repeat(starts, counts)
+        self.cell_nodes[np.repeat(np.arange(len(unique_keys)), counts), column] = order
+
+        self.grid = np.full(int(np.prod(self.shape)), -1, dtype=np.int64)
+        self.grid[unique_keys] = np.arange(len(unique_keys))
+        self.grid = self.grid.reshape(self.shape)
+
+        self._ring_cache = {}
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def _cell_of(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+
+    def _ring_offsets(self, ring: int) -> np.ndarray:
+        """Cell offsets at Chebyshev distance `ring`, limited to offsets that can reach the grid."""
+        if ring not in self._ring_cache:
+            limits = np.minimum(ring, self.shape)
+            axes = [np.arange(-lim, lim + 1) for lim in limits]
+            offsets = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+            self._ring_cache[ring] = offsets[np.abs(offsets).max(axis=1) == ring]
+        return self._ring_cache[ring]
+
+    def _candidates(self, cells: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Node indices in the cells `cells + offsets` for every query, shape (Q, len(offsets) * max_per_cell)."""
+        neighbor = cells[:, None, :] + offsets[None, :, :]
+        inside = np.all((neighbor >= 0) & (neighbor < self.shape), axis=-1)
+        slots = np.full(inside.shape, -1, dtype=np.int64)
+        slots[inside] = self.grid[tuple(neighbor[inside].T)]
+        nodes = np.where(slots[..., None] >= 0, self.cell_nodes[slots], -1)
+        return nodes.reshape(len(cells), -1)
+
+    def _merge(self, points: np.ndarray, best_i: np.ndarray, best_d: np.ndarray,
+               candidates: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge candidate nodes into the running k best (index, squared distance) per query."""
+        diff = self.pos[candidates] - points[:, None, :]
+        dist = np.einsum("qcd,qcd->qc", diff, diff)
+        dist[candidates < 0] = np.inf
+
+        if k == 1:
+            col = np.argmin(dist, axis=1)[:, None]
+            cand_i = np.take_along_axis(candidates, col, axis=1)
+            cand_d = np.take_along_axis(dist, col, axis=1)
+            closer = cand_d < best_d
+            return np.where(closer, cand_i, best_i), np.where(closer, cand_d, best_d)
+
+        all_i = np.concatenate([best_i, candidates], axis=1)
+        all_d = np.concatenate([best_d, dist], axis=1)
+        keep = np.argsort(all_d, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(all_i, keep, axis=1), np.take_along_axis(all_d, keep, axis=1)
+
+    def query_indices(self, points, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest nodes for each query point.
+
+        Args:
+            points: array-like of shape (Q, 3).
+            k: number of neighbors per query.
+
+        Returns:
+            Tuple of (indices, distances), both of shape (Q, k), sorted by distance.
+            Missing neighbors (k larger than the index) have index -1 and distance inf.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        q = len(points)
+        best_i = np.full((q, k), -1, dtype=np.int64)
+        best_d = np.full((q, k), np.inf)
+
+        cells = self._cell_of(points)
+        # Queries far outside the grid would need many empty rings; compare them against every node instead
+        outside = np.any((cells < -1) | (cells > self.shape), axis=1)
+        if outside.any():
+            everything = np.broadcast_to(np.arange(len(self.pos)), (int(outside.sum()), len(self.pos)))
+            best_i[outside], best_d[outside] = self._merge(points[outside], best_i[outside], best_d[outside],
+                                                           everything, k)
+
+        active = np.flatnonzero(~outside)
+        max_ring = int(self.shape.max())
+        for ring in range(max_ring + 1):
+            if len(active) == 0:
+                break
+            candidates = self._candidates(cells[active], self._ring_offsets(ring))
+            best_i[active], best_d[active] = self._merge(points[active], best_i[active], best_d[active],
+                                                         candidates, k)
+            # Every node in ring + 1 or beyond is at least ring * cell_size away
+            bound = (ring * self.cell_size) ** 2
+            active = active[best_d[active, -1] > bound]
+
+        return best_i, np.sqrt(best_d)
+
+    def query(self, points, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized nearest-node lookup.
+
+        Args:
+            points: array-like of shape (Q, 3).
+            k: number of neighbors per query.
+
+        Returns:
+            Tuple of (node_ids, distances). With k == 1 both have shape (Q,);
+            otherwise (Q, k). Missing neighbors have node ID "" and distance inf.
+        """
+        indices, distances = self.query_indices(points, k)
+        node_ids = np.where(indices >= 0, self.node_ids[np.maximum(indices, 0)], "")
+        if k == 1:
+            return node_ids[:, 0], distances[:, 0]
+        return node_ids, distances
+
+    def nearest(self, target_pos: Tuple[float, float, float]) -> Dict:
+        """
+        Find the closest node to a single position.
+
+        Returns:
+            Dictionary with node_id, pos and distance, like find_closest_node.
+        """
+        indices, distances = self.query_indices([target_pos], 1)
+        i = int(indices[0, 0])
+        return {"node_id": str(self.node_ids[i]), "pos": tuple(self.pos[i].tolist()),
+                "distance": float(distances[0, 0])}
+
+    def query_radius(self, points, radius: float) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find every node within `radius` of each query point.
+
+        Args:
+            points: array-like of shape (Q, 3).
+            radius: search radius.
+
+        Returns:
+            List with one (node_ids, distances) pair per query, sorted by distance.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        rings = int(np.ceil(radius / self.cell_size))
+        offsets = np.concatenate([self._ring_offsets(r) for r in range(min(rings, int(self.shape.max())) + 1)])
+        # Clamp outside queries to the nearest grid cell: the grid cells within `rings` of the
+        # query's own cell are all within `rings` of the clamped one
+        cells = np.clip(self._cell_of(points), 0, self.shape - 1)
+        candidates = self._candidates(cells, offsets)
+
+        diff = self.pos[candidates] - points[:, None, :]
+        dist = np.sqrt(np.einsum("qcd,qcd->qc", diff, diff))
+        dist[candidates < 0] = np.inf
+
+        results = []
+        for row, row_dist in zip(candidates, dist):
+            hit = np.flatnonzero(row_dist <= radius)
+            hit = hit[np.argsort(row_dist[hit], kind="stable")]
+            results.append((self.node_ids[row[hit]], row_dist[hit]))
+        return results
+
+
+def _auto_cell_size(extent: np.ndarray, num_nodes: int) -> float:
+    """Cell size giving roughly _NODES_PER_CELL nodes per cell over the non-flat axes of the bounding box."""
+    spans = extent[extent > 0]
+    if len(spans) == 0:
+        return 1.0
+    volume_per_node = np.prod(spans) * _NODES_PER_CELL / num_nodes
+    return float(max(volume_per_node ** (1.0 / len(spans)), 1e-9))
+
+
+def _node_mask(attributes: Dict[str, np.ndarray], only: Union[None, str, Iterable[str]], count: int) -> np.ndarray:
+    if only is None:
+        return np.ones(count, dtype=bool)
+    names = [only] if isinstance(only, str) else list(only)
+    mask = np.ones(count, dtype=bool)
+    for name in names:
+        if name not in attributes:
+            raise ValueError(f"Unknown node class '{name}'.")
+        mask &= attributes[name]
+    return mask
+
+
+def build_spatial_index(graph, only: Union[None, str, Iterable[str]] = None,
+                        cell_size: Optional[float] = None) -> SpatialIndex:
+    """
+    Build a spatial index over the nodes of a warehouse graph.
+
+    Args:
+        graph: networkx DiGraph from build_graph or a CompactGraph.
+        only: node class (or classes) to restrict matches to, e.g. "is_entrance"
+            or ["is_intersection"]; a node must have every listed flag set.
+        cell_size: grid cell edge length; chosen automatically if omitted.
+
+    Returns:
+        SpatialIndex over the selected nodes.
+    """
+    if hasattr(graph, "node_ids"):
+        node_ids = np.array(graph.node_ids, dtype=str)
+        positions = graph.pos
+        attributes = {"is_intersection": graph.is_intersection, "is_entrance": graph.is_entrance}
+    else:
+        node_ids = np.array(list(graph.nodes), dtype=str)
+        data = [graph.nodes[node] for node in graph.nodes]
+        positions = np.array([d["pos"] for d in data], dtype=np.float64).reshape(-1, 3)
+        attributes = {
+            "is_intersection": np.array([d.get("is_intersection", False) for d in data], dtype=bool),
+            "is_entrance": np.array([d.get("is_entrance", False) for d in data], dtype=bool),
+        }
+
+    mask = _node_mask(attributes, only, len(node_ids))
+    return SpatialIndex(node_ids[mask], positions[mask], cell_size=cell_size)
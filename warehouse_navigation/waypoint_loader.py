@@ -0,0 +1,153 @@
+import json
+import os
+import time
+import warnings
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .graph_builder import build_graph_from_rows
+
+WAYPOINT_CACHE_VERSION = 1
+STREAM_BATCH_SIZE = 5000
+
+
+def _get_engine(db):
+    from sqlalchemy import create_engine
+
+    return create_engine(db, future=True) if isinstance(db, str) else db
+
+
+def _waypoint_columns():
+    from models.models import NavigationWaypoint
+
+    return (
+        NavigationWaypoint.passage_id,
+        NavigationWaypoint.order,
+        NavigationWaypoint.position_x,
+        NavigationWaypoint.position_y,
+        NavigationWaypoint.position_z,
+        NavigationWaypoint.is_intersection,
+        NavigationWaypoint.is_entrance,
+    )
+
+
+def waypoint_watermark(conn, watermark_column: Optional[str] = None) -> str:
+    """
+    Return a string that changes whenever navigation_waypoints changes.
+
+    Row count and max(id) catch inserts and deletes; pass watermark_column
+    (e.g. "updated_at") when the table has one, so updates are caught too.
+    """
+    from sqlalchemy import func, select
+
+    from models.models import NavigationWaypoint
+
+    columns = [func.count(), func.max(NavigationWaypoint.id)]
+    if watermark_column:
+        columns.append(func.max(NavigationWaypoint.__table__.c[watermark_column]))
+    row = conn.execute(select(*columns)).one()
+    return json.dumps([str(value) for value in row])
+
+
+def _save_rows(cache_path: Path, rows, watermark: str):
+    passage_id, order, x, y, z, is_intersection, is_entrance = zip(*rows) if rows else ([],) * 7
+    with cache_path.open("wb") as f:
+        np.savez(
+            f,
+            version=np.array(WAYPOINT_CACHE_VERSION),
+            watermark=np.array(watermark),
+            passage_id=np.array(passage_id, dtype=str),
+            order=np.array(order, dtype=np.int64),
+            pos=np.column_stack([x, y, [0 if v is None else v for v in z]]).astype(np.float64).reshape(-1, 3),
+            is_intersection=np.array(is_intersection, dtype=bool),
+            is_entrance=np.array(is_entrance, dtype=bool),
+        )
+
+
+def _load_rows(cache_path: Path, watermark: Optional[str]):
+    """Rows stored in a cache file, or None if it is missing, outdated or unreadable."""
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            if int(data["version"]) != WAYPOINT_CACHE_VERSION:
+                return None
+            if watermark is not None and str(data["watermark"]) != watermark:
+                return None
+            pos = data["pos"]
+            return list(zip(data["passage_id"].tolist(), data["order"].tolist(),
+                            pos[:, 0].tolist(), pos[:, 1].tolist(), pos[:, 2].tolist(),
+                            data["is_intersection"].tolist(), data["is_entrance"].tolist()))
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def load_graph_from_db(db, cache_path: Optional[Union[str, Path]] = None,
+                       watermark_column: Optional[str] = None, refresh: bool = False,
+                       max_age_seconds: Optional[float] = None) -> Tuple:
+    """
+    Build the warehouse graph from the navigation_waypoints table.
+
+    Waypoints are streamed in one query ordered by (passage_id, order) and fed
+    to build_graph_from_rows as they arrive. With cache_path, the rows are also
+    snapshotted to a local binary file. A readable snapshot is served without
+    contacting the database, so a cold start does not wait on it; the table's
+    watermark is only checked (and the snapshot rebuilt if it changed) with
+    refresh=True or once the snapshot is older than max_age_seconds. If the
+    database cannot be reached during a check, the last snapshot is used.
+
+    Args:
+        db: SQLAlchemy engine or database URL.
+        cache_path: optional .npz file for the local snapshot.
+        watermark_column: optional timestamp column (e.g. "updated_at") included in the watermark.
+        refresh: check the watermark before using the snapshot.
+        max_age_seconds: check the watermark once this long has passed since
+            the snapshot was written or last found current; None never expires it.
+
+    Returns:
+        (G, pos_to_node) as returned by build_graph.
+    """
+    from sqlalchemy import select
+    from sqlalchemy.exc import OperationalError
+
+    cache_path = Path(cache_path) if cache_path else None
+    if cache_path is not None and not refresh and cache_path.exists():
+        age = time.time() - cache_path.stat().st_mtime
+        if max_age_seconds is None or age <= max_age_seconds:
+            rows = _load_rows(cache_path, None)
+            if rows is not None:
+                return build_graph_from_rows(rows)
+
+    engine = _get_engine(db)
+    columns = _waypoint_columns()
+    stmt = select(*columns).order_by(columns[0], columns[1])
+
+    try:
+        with engine.connect() as conn:
+            if cache_path is None:
+                result = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE).execute(stmt)
+                return build_graph_from_rows(tuple(row) for row in result)
+
+            watermark = waypoint_watermark(conn, watermark_column)
+            rows = _load_rows(cache_path, watermark) if cache_path.exists() else None
+            if rows is not None:
+                # Still current: restart its max_age_seconds window
+                try:
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+            else:
+                result = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE).execute(stmt)
+                rows = [tuple(row) for row in result]
+                try:
+                    _save_rows(cache_path, rows, watermark)
+                except OSError:
+                    pass
+    except OperationalError as e:
+        rows = _load_rows(cache_path, None) if cache_path is not None and cache_path.exists() else None
+        if rows is None:
+            raise
+        warnings.warn(f"Database unavailable ({e.__class__.__name__}), using waypoint snapshot {cache_path}.",
+                      RuntimeWarning, stacklevel=2)
+
+    return build_graph_from_rows(rows)
@@ -0,0 +1,181 @@
+import mmap
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+DEFAULT_DATA_DIR = Path(__file__).parent / "data"
+
+# e.g. rami_st1_17_13.yaml -> site "rami", station 1, passages 17 and 13
+YAML_FILENAME_PATTERN = re.compile(r"^(?P<site>.+)_st(?P<station>\d+)_(?P<first>\d+)_(?P<second>\d+)\.yaml$")
+
+
+def parse_yaml_filename(filename: str) -> Optional[Dict]:
+    """
+    Parse a passage YAML filename such as 'rami_st1_17_13.yaml'.
+
+    Returns:
+        Dictionary with site, station, first_passage and second_passage, or
+        None if the filename does not follow the pattern.
+    """
+    match = YAML_FILENAME_PATTERN.match(filename)
+    if not match:
+        return None
+    return {
+        "site": match["site"],
+        "station": int(match["station"]),
+        "first_passage": int(match["first"]),
+        "second_passage": int(match["second"]),
+    }
+
+
+def _passage_key(passage: Union[str, int]) -> int:
+    return int(passage)
+
+
+class YamlAssetIndex:
+    """
+    Index of the passage YAML code files, built once per data directory.
+
+    Files are keyed by their (first_passage, second_passage) pair, parsed from
+    the filename, and can be found in either direction. File contents are kept
+    in an LRU cache that is invalidated when a file's mtime or size changes;
+    the directory is rescanned when its own mtime changes.
+
+    Args:
+        data_dir: directory holding the YAML files.
+        max_cached_files: number of file contents kept in memory.
+    """
+
+    def __init__(self, data_dir: Union[str, Path] = DEFAULT_DATA_DIR, max_cached_files: int = 16):
+        self.data_dir = Path(data_dir)
+        self.max_cached_files = max_cached_files
+        self._lock = threading.Lock()
+        self._files: Dict[Tuple[int, int], Path] = {}
+        self._dir_mtime = None
+        self._contents: "OrderedDict[Path, Tuple[Tuple[int, int], str]]" = OrderedDict()
+        self._mmaps: Dict[Path, Tuple[Tuple[int, int], mmap.mmap]] = {}
+        self.refresh()
+
+    def refresh(self):
+        """Rescan the data directory."""
+        files = {}
+        dir_mtime = None
+        if self.data_dir.is_dir():
+            dir_mtime = self.data_dir.stat().st_mtime_ns
+            for path in sorted(self.data_dir.glob("*.yaml")):
+                info = parse_yaml_filename(path.name)
+                if info is None:
+                    continue
+                key = (info["first_passage"], info["second_passage"])
+                files.setdefault(key, path)
+        with self._lock:
+            self._files = files
+            self._dir_mtime = dir_mtime
+
+    def _check_directory(self):
+        try:
+            dir_mtime = self.data_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime = None
+        if dir_mtime != self._dir_mtime:
+            self.refresh()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def find(self, start_passage: Union[str, int], end_passage: Union[str, int]) -> Optional[Path]:
+        """
+        Return the YAML file covering the route between two passages, in either direction.
+
+        Args:
+            start_passage: passage ID the route starts in.
+            end_passage: passage ID the route ends in.
+
+        Returns:
+            Path of the file, or None if there is none.
+        """
+        self._check_directory()
+        start, end = _passage_key(start_passage), _passage_key(end_passage)
+        return self._files.get((start, end)) or self._files.get((end, start))
+
+    def read(self, start_passage: Union[str, int], end_passage: Union[str, int]) -> Optional[str]:
+        """
+        Return the content of the YAML file between two passages, served from the LRU cache.
+
+        Returns:
+            The file content as a string, or None if there is no file.
+        """
+        path = self.find(start_passage, end_passage)
+        if path is None:
+            return None
+        return self.read_file(path)
+
+    def read_file(self, path: Union[str, Path]) -> str:
+        """Return a file's content through the LRU cache, re-reading it if it changed on disk."""
+        path = Path(path)
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._contents.get(path)
+            if cached is not None and cached[0] == version:
+                self._contents.move_to_end(path)
+                return cached[1]
+
+        content = path.read_text()
+
+        with self._lock:
+            self._contents[path] = (version, content)
+            self._contents.move_to_end(path)
+            while len(self._contents) > self.max_cached_files:
+                self._contents.popitem(last=False)
+        return content
+
+    def mmap(self, start_passage: Union[str, int], end_passage: Union[str, int]) -> Optional[mmap.mmap]:
+        """
+        Return a read-only memory map of the YAML file between two passages.
+
+        The map is shared between callers and replaced when the file changes,
+        so the operating system's page cache serves repeated reads without
+        copying the file into Python memory.
+
+        Returns:
+            The mmap object, or None if there is no file.
+        """
+        path = self.find(start_passage, end_passage)
+        if path is None:
+            return None
+
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._mmaps.get(path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmaps[path] = (version, mapped)
+        return mapped
+
+    def clear_cache(self):
+        """Drop all cached contents and memory maps."""
+        with self._lock:
+            self._contents.clear()
+            self._mmaps.clear()
+
+
+_default_index: Optional[YamlAssetIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_yaml_index() -> YamlAssetIndex:
+    """Return the process-wide index of warehouse_navigation/data, building it on first use."""
+    global _default_index
+    if _default_index is None:
+        with _default_index_lock:
+            if _default_index is None:
+                _default_index = YamlAssetIndex(DEFAULT_DATA_DIR)
+    return _default_index